@@ -0,0 +1,139 @@
+import time
+
+import pygame
+from config import *
+
+
+# === ASSETS ===
+# name -> (path under assets/, size to fit in or None). Sources are 1024 px and up, they are scaled
+# once at load time to what the game draws; the aspect ratio is kept.
+SPRITES = {
+    "enemy": ("img/Enemy.png", (50, 50)),
+    "bomb": ("img/Bomb.png", (60, 60)),
+    "gun": ("img/Gun.png", (64, 64)),
+    "machete": ("img/Machete.png", (64, 64)),
+    "carriage": ("img/Carriage.png", (200, 200)),
+    "screw": ("Screw.png", (32, 32)),
+    "board": ("Board.png", (600, 600)),
+    "background": ("BG Image.png", (SC_W, SC_H)),
+}
+ATLAS_MAX_SPRITE = 256  # Sprites up to this size on both sides share the atlas
+ATLAS_MAX_SIZE = 2048
+ATLAS_PADDING = 1
+
+
+def pack_shelves(sizes, side, padding=ATLAS_PADDING):
+    """ Shelf packing, tallest first: {name: (w, h)} -> {name: Rect} inside side x side, or None """
+    rects = {}
+    x = y = shelf = 0
+    for name, (w, h) in sorted(sizes.items(), key=lambda item: (-item[1][1], -item[1][0])):
+        if x + w > side:
+            x, y, shelf = 0, y + shelf + padding, 0
+        if x + w > side or y + h > side:
+            return None
+        rects[name] = pygame.Rect(x, y, w, h)
+        x += w + padding
+        shelf = max(shelf, h)
+    return rects
+
+
+class AssetManager:
+    """ Loads every image once, scaled and converted to the display format. Small sprites are packed
+    into one atlas surface and handed out as subsurfaces of it. Lazy by default: get() loads on first
+    use, preload() loads everything up front and builds the atlas """
+    def __init__(self, sprites=SPRITES, eager=False):
+        self.sprites = sprites
+        self.surfaces = {}   # name -> Surface (a subsurface of the atlas once packed)
+        self.report = {}     # name -> {"ms", "bytes", "size", "atlas"}
+        self.atlas = None
+        if eager:
+            self.preload()
+
+    def _convert(self, surface):
+        # Display format needs a display mode, headless runs keep the file's format
+        if pygame.display.get_surface() is None:
+            return surface
+        return surface.convert_alpha()
+
+    def _load(self, name):
+        path, fit = self.sprites[name]
+        start = time.perf_counter()
+        image = pygame.image.load(resource_path(ASSETS_DIR / path))
+        if fit and image.get_size() != tuple(fit):
+            scale = min(fit[0] / image.get_width(), fit[1] / image.get_height())
+            size = (max(1, round(image.get_width() * scale)), max(1, round(image.get_height() * scale)))
+            image = pygame.transform.smoothscale(image, size)
+        image = self._convert(image)
+        elapsed = time.perf_counter() - start
+        STARTUP.add("assets", elapsed)
+        self.report[name] = {
+            "ms": round(elapsed * 1000, 3),
+            "bytes": image.get_width() * image.get_height() * image.get_bytesize(),
+            "size": image.get_size(),
+            "atlas": False,
+        }
+        return image
+
+    def get(self, name):
+        surface = self.surfaces.get(name)
+        if surface is None:
+            surface = self.surfaces[name] = self._load(name)
+        return surface
+
+    def preload(self):
+        for name in self.sprites:
+            self.get(name)
+        self.pack()
+
+    def pack(self):
+        # Moves every small loaded sprite into a fresh atlas, the standalone copies are dropped
+        small = {name: s.get_size() for name, s in self.surfaces.items() if max(s.get_size()) <= ATLAS_MAX_SPRITE}
+        if all(self.report[name]["atlas"] for name in small):
+            return  # Nothing new since the last pack
+
+        side = 64
+        rects = pack_shelves(small, side)
+        while rects is None and side < ATLAS_MAX_SIZE:
+            side *= 2
+            rects = pack_shelves(small, side)
+        if rects is None:
+            print(f"Atlas: sprites don't fit in {ATLAS_MAX_SIZE}px, left standalone")
+            return
+
+        # Cut at the last shelf, the rest of the square would be empty
+        height = max(rect.bottom for rect in rects.values())
+        atlas = self._convert(pygame.Surface((side, height), pygame.SRCALPHA))
+        atlas.fill((0, 0, 0, 0))
+        atlas.blits([(self.surfaces[name], rect) for name, rect in rects.items()], doreturn=False)
+        for name, rect in rects.items():
+            self.surfaces[name] = atlas.subsurface(rect)
+            self.report[name]["atlas"] = True
+        self.atlas = atlas
+
+    def stats(self):
+        standalone = sum(info["bytes"] for info in self.report.values() if not info["atlas"])
+        atlas = self.atlas.get_width() * self.atlas.get_height() * self.atlas.get_bytesize() if self.atlas else 0
+        return {
+            "loaded": len(self.surfaces),
+            "load_ms": round(sum(info["ms"] for info in self.report.values()), 3),
+            "standalone_bytes": standalone,
+            "atlas_bytes": atlas,
+            "atlas_size": self.atlas.get_size() if self.atlas else None,
+        }
+
+    def print_report(self):
+        for name, info in self.report.items():
+            where = "atlas" if info["atlas"] else "standalone"
+            print(f"{name:<12}{info['size'][0]:>5}x{info['size'][1]:<5}{info['bytes'] / 1024:>9.1f} KiB"
+                  f"{info['ms']:>9.2f} ms  {where}")
+        stats = self.stats()
+        print(f"{stats['loaded']} assets in {stats['load_ms']:.2f} ms, atlas {stats['atlas_size']} "
+              f"{stats['atlas_bytes'] / 1024:.1f} KiB, standalone {stats['standalone_bytes'] / 1024:.1f} KiB")
+
+
+ASSETS = AssetManager()
+
+
+if __name__ == "__main__":
+    ASSETS.preload()
+    ASSETS.print_report()
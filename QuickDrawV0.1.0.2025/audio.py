@@ -0,0 +1,118 @@
+import time
+
+import pygame
+from config import *
+
+
+# === AUDIO ===
+# name -> (path under assets/, volume, minimum ms between two plays). Every file is decoded once into a
+# PCM Sound, playing one is then just a mix on one of a fixed set of reserved channels.
+SOUNDS = {
+    "shoot": ("sfx/gunshot.mp3", 0.5, 40),
+    "empty": ("sfx/buzzer.wav", 0.4, 250),  # Trigger pulled on an empty gun
+}
+SFX_ENABLED = not HEADLESS
+SFX_CHANNELS = 8  # Voices playing at once, the oldest one is cut when all are busy
+
+
+class SoundBank:
+    """ Decoded sound effects and the channel pool that plays them. Lazy by default: play() decodes a
+    sound on first use, preload() decodes everything up front. Silent when there is no audio device """
+    def __init__(self, sounds=SOUNDS, channels=SFX_CHANNELS, enabled=SFX_ENABLED):
+        self.sounds = sounds
+        self.size = channels
+        self.enabled = enabled
+        self.decoded = {}       # name -> Sound, None when its file could not be decoded
+        self.lengths = {}       # name -> seconds
+        self.last_played = {}   # name -> perf_counter seconds
+        self.played = self.limited = self.stolen = 0
+
+        # Voices are tracked here instead of asking the mixer: every get_busy() takes the audio lock
+        self._channels = None   # [Channel], reserved so nothing else plays on them
+        self._started = []      # perf_counter seconds each channel's sound started
+        self._ends = []         # ... and when it finishes
+
+    def _ready(self):
+        if self._channels is None:
+            if not self.enabled or not init_audio():
+                self.enabled = False
+                return False
+            pygame.mixer.set_num_channels(max(self.size, pygame.mixer.get_num_channels()))
+            pygame.mixer.set_reserved(self.size)
+            self._channels = [pygame.mixer.Channel(i) for i in range(self.size)]
+            self._started = [0.0] * self.size
+            self._ends = [0.0] * self.size
+        return True
+
+    def get(self, name):
+        # None when the file can't be decoded (missing, corrupt, no codec for it): that one sound stays
+        # silent, the way the whole bank does without an audio device
+        if name in self.decoded:
+            return self.decoded[name]
+        path, volume, _ = self.sounds[name]
+        start = time.perf_counter()
+        try:
+            sound = pygame.mixer.Sound(resource_path(ASSETS_DIR / path))
+        except (pygame.error, OSError) as e:
+            print(f"Sound {name} disabled: {e}")
+            sound = None
+        else:
+            sound.set_volume(volume)
+            self.lengths[name] = sound.get_length()
+        self.decoded[name] = sound
+        STARTUP.add("audio", time.perf_counter() - start)
+        return sound
+
+    def preload(self):
+        if self._ready():
+            for name in self.sounds:
+                self.get(name)
+
+    def _channel(self, now):
+        # A free channel, else the one playing the oldest sound
+        ends = self._ends
+        for index in range(self.size):
+            if ends[index] <= now:
+                return index
+        self.stolen += 1
+        return min(range(self.size), key=self._started.__getitem__)
+
+    def play(self, name):
+        """ Play a sound now, returns its Channel or None when rate limited or silent """
+        if not self.enabled or not self._ready():
+            return None
+        now = time.perf_counter()
+        if (now - self.last_played.get(name, -1e9)) * 1000 < self.sounds[name][2]:
+            self.limited += 1
+            return None
+        self.last_played[name] = now
+
+        sound = self.get(name)
+        if sound is None:
+            return None
+        index = self._channel(now)
+        channel = self._channels[index]
+        channel.play(sound)
+        self._started[index] = now
+        self._ends[index] = now + self.lengths[name]
+        self.played += 1
+        return channel
+
+    def stop(self):
+        if self._channels:
+            for channel in self._channels:
+                channel.stop()
+            self._ends = [0.0] * self.size
+
+    def stats(self):
+        return {
+            "decoded": sum(sound is not None for sound in self.decoded.values()),
+            "failed": sum(sound is None for sound in self.decoded.values()),
+            "played": self.played,
+            "limited": self.limited,
+            "stolen": self.stolen,
+            "busy": sum(end > time.perf_counter() for end in self._ends),
+        }
+
+
+SFX = SoundBank()
@@ -0,0 +1,254 @@
+import os
+import json
+import zlib
+import queue
+import base64
+import struct
+import threading
+
+from config import *
+
+
+# === AUTOSAVE ===
+# A full checkpoint (same container as savegame.dat) plus a journal of deltas appended after it.
+# Loading replays the journal over the checkpoint; every few deltas a new checkpoint replaces both.
+AUTOSAVE_PATH = DATA_DIR / "autosave.dat"
+JOURNAL_PATH = DATA_DIR / "autosave.journal"
+AUTOSAVE_INTERVAL = 0 if HEADLESS else 15.0  # Simulated seconds between autosaves, 0 = off
+AUTOSAVE_CHECKPOINT_EVERY = 8                # Deltas before the journal is compacted
+
+# Journal record: [length][nonce][AES-GCM(zlib(JSON delta))], authenticated with (checkpoint id, seq)
+_RECORD_LENGTH = struct.Struct("<I")
+_RECORD_AAD = struct.Struct("<8sI")
+
+
+def capture(game):
+    # Everything an autosave writes, entities keyed by their registry handle
+    spawner = game.spawner.to_dict()
+    items = game.items_spawn.to_dict()
+    enemies = spawner.pop("spawned_enemies")
+    item_list = items.pop("spawned_items")
+    return {
+        "player": game.player.to_dict(),
+        "spawners": spawner,
+        "items": items,
+        "enemies": dict(zip((str(e._handle) for e in game.spawner.spawned_enemies), enemies)),
+        "item_list": dict(zip((str(i._handle) for i in game.items_spawn.spawned_items), item_list)),
+        "projectiles": game.spawner.projectiles.to_bytes(),
+    }
+
+
+def changed_fields(old, new):
+    return {key: value for key, value in new.items() if old.get(key) != value}
+
+
+def entity_delta(old, new):
+    return {
+        "new": {key: value for key, value in new.items() if key not in old},
+        "changed": {key: fields for key, value in new.items()
+                    if key in old and (fields := changed_fields(old[key], value))},
+        "destroyed": [key for key in old if key not in new],
+    }
+
+
+def apply_entity_delta(entities, delta):
+    for key in delta["destroyed"]:
+        entities.pop(key, None)
+    for key, fields in delta["changed"].items():
+        entities[key].update(fields)
+    entities.update(delta["new"])
+
+
+class JournalWriter:
+    """ Background thread running autosave writes strictly in order """
+    def __init__(self):
+        self._queue = queue.Queue()
+        self._thread = None
+
+    def submit(self, task, *args):
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="autosave-writer", daemon=True)
+            self._thread.start()
+        self._queue.put((task, args))
+
+    def _run(self):
+        while True:
+            task, args = self._queue.get()
+            try:
+                if task is None:
+                    return
+                task(*args)
+            except Exception as e:
+                print(f"❌ Autosave failed: {e}")
+            finally:
+                self._queue.task_done()
+
+    def wait(self):
+        # Barrier: everything submitted so far is on disk
+        if self._thread:
+            self._queue.join()
+
+    def shutdown(self):
+        if self._thread:
+            self._queue.put((None, ()))
+            self._thread.join()
+        self._thread = None
+
+
+JOURNAL_WRITER = JournalWriter()
+
+
+class Autosaver:
+    """ Periodic autosave of a running Game. Each autosave costs one capture of the live
+    entities, however long the run has been going """
+    def __init__(self, interval=AUTOSAVE_INTERVAL, checkpoint_every=AUTOSAVE_CHECKPOINT_EVERY,
+                 path=AUTOSAVE_PATH, journal_path=JOURNAL_PATH, writer=JOURNAL_WRITER):
+        self.interval = interval
+        self.checkpoint_every = checkpoint_every
+        self.path = path
+        self.journal_path = journal_path
+        self.writer = writer
+        self.timer = 0.0
+        self.seq = 0
+        self.checkpoint_id = None
+        self.last = None  # State as of the last autosave
+
+    def update(self, dt, game):
+        if not self.interval:
+            return
+        self.timer += dt
+        if self.timer >= self.interval:
+            self.timer = 0.0
+            self.save(game)
+
+    def save(self, game):
+        state = capture(game)
+        if self.last is None or self.seq >= self.checkpoint_every:
+            self.checkpoint(state)
+        else:
+            self.seq += 1
+            delta = {
+                "player": changed_fields(self.last["player"], state["player"]),
+                "spawners": changed_fields(self.last["spawners"], state["spawners"]),
+                "items": changed_fields(self.last["items"], state["items"]),
+                "enemies": entity_delta(self.last["enemies"], state["enemies"]),
+                "item_list": entity_delta(self.last["item_list"], state["item_list"]),
+                "projectiles": base64.b64encode(state["projectiles"]).decode(),
+            }
+            self.writer.submit(self._append, self.checkpoint_id, self.seq, delta)
+        self.last = state
+
+    def checkpoint(self, state):
+        self.checkpoint_id = os.urandom(8)
+        self.seq = 0
+        spawner = dict(state["spawners"], spawned_enemies=list(state["enemies"].values()))
+        items = dict(state["items"], spawned_items=list(state["item_list"].values()))
+        data = {
+            "player": state["player"],
+            "spawners": spawner,
+            "items": items,
+            "projectiles": state["projectiles"],
+            "autosave": {
+                "id": self.checkpoint_id.hex(),
+                "enemies": list(state["enemies"]),
+                "item_list": list(state["item_list"]),
+            },
+        }
+        self.writer.submit(self._write_checkpoint, data)
+
+    def _write_checkpoint(self, data):
+        encrypt_save(data, self.path)
+        # Records of the previous checkpoint no longer authenticate, a crash here loses nothing
+        with open(self.journal_path, "wb"):
+            pass
+
+    def _append(self, checkpoint_id, seq, delta):
+        raw = zlib.compress(json.dumps(delta, separators=(",", ":")).encode(), SAVE_COMPRESSION)
+        nonce = os.urandom(SAVE_NONCE_SIZE)
+        encrypted = save_cipher().encrypt(nonce, raw, _RECORD_AAD.pack(checkpoint_id, seq))
+        with open(self.journal_path, "ab") as f:
+            f.write(_RECORD_LENGTH.pack(len(nonce) + len(encrypted)) + nonce + encrypted)
+            f.flush()
+            os.fsync(f.fileno())
+
+    def discard(self):
+        # Run over: nothing to resume
+        self.last = None
+        self.writer.submit(remove_autosave, self.path, self.journal_path)
+
+
+def remove_autosave(path=AUTOSAVE_PATH, journal_path=JOURNAL_PATH):
+    for filename in (path, journal_path):
+        if os.path.exists(filename):
+            os.remove(filename)
+
+
+def read_journal(journal_path, checkpoint_id):
+    # Deltas in order, up to the first torn or foreign record
+    if not os.path.exists(journal_path):
+        return
+    with open(journal_path, "rb") as f:
+        blob = f.read()
+
+    cipher = save_cipher()
+    offset = 0
+    seq = 1
+    while offset + _RECORD_LENGTH.size <= len(blob):
+        (length,) = _RECORD_LENGTH.unpack_from(blob, offset)
+        record = blob[offset + _RECORD_LENGTH.size:offset + _RECORD_LENGTH.size + length]
+        if len(record) < length:
+            return  # Crashed mid-append
+        try:
+            raw = cipher.decrypt(record[:SAVE_NONCE_SIZE], record[SAVE_NONCE_SIZE:], _RECORD_AAD.pack(checkpoint_id, seq))
+        except crypto().InvalidTag:
+            return
+        yield json.loads(zlib.decompress(raw))
+        offset += _RECORD_LENGTH.size + length
+        seq += 1
+
+
+def load_autosave(path=AUTOSAVE_PATH, journal_path=JOURNAL_PATH):
+    """ Checkpoint with the journal replayed over it, in the same shape as load_save_data() """
+    JOURNAL_WRITER.wait()
+    if not os.path.exists(path):
+        return None
+    try:
+        data = decrypt_load(path)
+    except Exception:
+        return None
+
+    meta = data.pop("autosave")
+    enemies = dict(zip(meta["enemies"], data["spawners"].pop("spawned_enemies")))
+    item_list = dict(zip(meta["item_list"], data["items"].pop("spawned_items")))
+
+    replayed = 0
+    for delta in read_journal(journal_path, bytes.fromhex(meta["id"])):
+        data["player"].update(delta["player"])
+        data["spawners"].update(delta["spawners"])
+        data["items"].update(delta["items"])
+        apply_entity_delta(enemies, delta["enemies"])
+        apply_entity_delta(item_list, delta["item_list"])
+        data["projectiles"] = base64.b64decode(delta["projectiles"])
+        replayed += 1
+
+    data["spawners"]["spawned_enemies"] = list(enemies.values())
+    data["items"]["spawned_items"] = list(item_list.values())
+    print(f"Autosave restored, {replayed} journal entries replayed")
+    return data
+
+
+def latest_save():
+    """ The newest of savegame.dat and the autosave, or None """
+    JOURNAL_WRITER.wait()
+    SAVE_WORKER.wait()
+
+    def modified(*paths):
+        return max((os.path.getmtime(p) for p in paths if os.path.exists(p)), default=None)
+
+    manual = modified(save_path)
+    auto = modified(AUTOSAVE_PATH, JOURNAL_PATH)
+    if auto is not None and (manual is None or auto > manual):
+        data = load_autosave()
+        if data:
+            return data
+    return load_save_data()
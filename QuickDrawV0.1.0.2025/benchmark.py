@@ -0,0 +1,242 @@
+import gc
+import os
+import sys
+import json
+import time
+import random
+import platform
+import argparse
+import contextlib
+import tracemalloc
+
+# Must be set before config is imported: no window, offscreen SCREEN
+os.environ["QUICKDRAW_HEADLESS"] = "1"
+
+import numpy
+import pygame
+from config import *
+from entity import *
+from main import Game
+from killcam import KillCam
+
+
+# Phases recorded by Game.step()/draw(), grouped for the report
+PHASE_GROUPS = {
+    "update": ("events", "tick_setup", "difficulty", "camera", "items", "enemies", "bombs", "projectiles", "flush", "autosave", "killcam"),
+    "collision": ("collision",),
+    "draw": ("draw_world", "draw_hud", "flip"),
+}
+
+# name -> scenario, every count is per scenario
+SCENARIOS = {
+    "idle": {},
+    "melee_100": {"enemies": {"melee": 100}},
+    "range_100": {"enemies": {"range": 100}},
+    "bomber_100": {"enemies": {"bomber": 100}},
+    "mixed_300": {"enemies": {"melee": 100, "range": 100, "bomber": 100}},
+    "bullets_2000": {"bullets": 2000},
+    "bombs_200": {"bombs": 200},
+    "upgrade_menu": {"enemies": {"melee": 30, "range": 30, "bomber": 30}, "upgrade_menu": True},
+    "late_stage_20": {"stage": 20, "enemies": {"melee": 70, "range": 70, "bomber": 70}, "bullets": 500},
+}
+
+
+def build_game(scenario, seed=0):
+    """ Fresh Game holding exactly the scenario's entities, with spawning off and an unkillable player """
+    random.seed(seed)
+    game = Game()
+    rect = game.rectmap.rect
+
+    game.player.take_dmg = lambda dmg: None
+    game.spawner.spawn_interval = float("inf")
+    game.items_spawn.spawn_interval = float("inf")
+    # Stay in the scenario's stage even if every enemy dies
+    game.difficulty.stage = scenario.get("stage", 0)
+    game.difficulty.update = lambda dt, current_enemies: None
+
+    mult = game.difficulty.multiplier()
+    for e_type, count in scenario.get("enemies", {}).items():
+        for _ in range(count):
+            x = random.randint(rect.left + 50, rect.right - 50)
+            y = random.randint(rect.top + 50, rect.bottom - 50)
+            enemy = ENEMY_POOL.acquire(x, y, 50, 50, e_type)
+            enemy.apply_difficulty(mult)
+            game.spawner.add_enemy(enemy)
+
+    # Bombs without an owner, far from ever exploding
+    for _ in range(scenario.get("bombs", 0)):
+        x = random.randint(0, SC_W)
+        y = random.randint(0, SC_H)
+        bomb = BOMB_POOL.acquire(x, y, 1)
+        bomb.timer = 1e6
+        game.spawner.bombs.create(bomb)
+
+    game.upgrade.show_menu = scenario.get("upgrade_menu", False)
+    # Headless games don't record, measure it as played
+    game.killcam = KillCam(seconds=5.0)
+    return game
+
+
+def top_up_bullets(game, target):
+    # Keep `target` bullets in flight, new ones start at the screen edge aimed at the player
+    projectiles = game.spawner.projectiles
+    px, py = game.player.rect.center
+    while len(projectiles) < target:
+        x = random.choice((0, SC_W))
+        y = random.uniform(0, SC_H)
+        direction = pygame.Vector2(px - x, py - y)
+        direction.scale_to_length(400)
+        projectiles.add(x, y, direction.x, direction.y, 4, 1, 400)
+
+
+def summarize(samples):
+    # Milliseconds
+    values = numpy.array(samples) * 1000
+    return {
+        "mean": round(float(values.mean()), 4),
+        "p95": round(float(numpy.percentile(values, 95)), 4),
+        "p99": round(float(numpy.percentile(values, 99)), 4),
+        "max": round(float(values.max()), 4),
+    }
+
+
+def run_scenario(name, scenario, frames=600, warmup=60, seed=0):
+    """ Run one scenario for a fixed number of frames, one simulation tick per frame """
+    tick_dt = 1 / SIM_HZ
+    bullets = scenario.get("bullets", 0)
+
+    sim_ms = [0]
+    set_sim_clock(lambda: sim_ms[0])
+    try:
+        game = build_game(scenario, seed)
+        phases = game.phases
+        samples = {group: [] for group in PHASE_GROUPS}
+        samples["frame"] = []
+        culling = {"drawn": [], "culled": []}
+        broadphase = {"candidate_pairs": [], "collisions": []}
+
+        # Bombs and bullets print when they go off, keep the report readable
+        with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+            for frame in range(warmup + frames):
+                sim_ms[0] = int(frame * tick_dt * 1000)
+                top_up_bullets(game, bullets)
+
+                start = time.perf_counter()
+                phases.begin_frame()
+                game.handle_events([], None)
+                phases.lap("events")
+                game.step(tick_dt)
+                game.draw(1.0)
+                # Same order as Game._run(), present() keeps the dirty rects rotating
+                if game.upgrade.show_menu:
+                    game.upgrade.upgrade_menu(game.player)
+                    game.renderer.invalidate()
+                phases.lap("draw_hud")
+                game.renderer.present()
+                phases.lap("flip")
+                total = time.perf_counter() - start
+                phases.begin_frame()
+
+                if frame < warmup:
+                    continue
+                for group, names in PHASE_GROUPS.items():
+                    samples[group].append(sum(phases.last.get(phase, 0.0) for phase in names))
+                samples["frame"].append(total)
+                culling["drawn"].append(game.culler.drawn)
+                culling["culled"].append(game.culler.culled)
+                for key, values in broadphase.items():
+                    values.append(game.collision_stats[key])
+    finally:
+        set_sim_clock(None)
+
+    return {
+        "scenario": scenario,
+        "frame_ms": summarize(samples.pop("frame")),
+        "phases_ms": {group: summarize(values) for group, values in samples.items()},
+        "entities": {
+            "enemies": len(game.spawner.spawned_enemies),
+            "bombs": len(game.spawner.bombs),
+            "bullets": len(game.spawner.projectiles),
+        },
+        "killcam": game.killcam.stats(),
+        # Mean draw calls made and skipped per frame
+        "culling": {key: round(float(numpy.mean(values)), 1) for key, values in culling.items()},
+        # Mean pairs the spatial hash handed to the exact test per tick, and how many collided
+        "broadphase": {key: round(float(numpy.mean(values)), 1) for key, values in broadphase.items()},
+    }
+
+
+def entity_memory(count=2000):
+    """ Average bytes allocated per live entity, everything it owns included """
+    def live(entity):
+        # The bookkeeping the pools, registries and interpolation add at runtime
+        entity._pooled = False
+        if not isinstance(entity, Bullet):
+            entity._handle = 0
+            entity._prev = (0, 0)
+        return entity
+
+    makers = {
+        "Enemy(melee)": lambda: live(Enemy(0, 0, 50, 50, "melee")),
+        "Enemy(range)": lambda: live(Enemy(0, 0, 50, 50, "range")),
+        "Enemy(bomber)": lambda: live(Enemy(0, 0, 50, 50, "bomber")),
+        "Bullet": lambda: live(Bullet(0, 0, (1, 0), 1)),
+        "Bomb": lambda: live(Bomb(0, 0, 1)),
+        "Item": lambda: live(Item(0, 0)),
+    }
+    report = {}
+    for name, make in makers.items():
+        gc.collect()
+        tracemalloc.start()
+        start = tracemalloc.get_traced_memory()[0]
+        entities = [make() for _ in range(count)]
+        used = tracemalloc.get_traced_memory()[0] - start - sys.getsizeof(entities)
+        tracemalloc.stop()
+        report[name] = round(used / count)
+        del entities
+    return report
+
+
+def metadata(frames, warmup, seed):
+    return {
+        "time": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": platform.python_version(),
+        "pygame": pygame.version.ver,
+        "numpy": numpy.__version__,
+        "platform": platform.platform(),
+        "processor": platform.processor(),
+        "screen": [SC_W, SC_H],
+        "sim_hz": SIM_HZ,
+        "frames": frames,
+        "warmup": warmup,
+        "seed": seed,
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Frame time benchmark of scripted stress scenarios")
+    parser.add_argument("--frames", type=int, default=600, help="measured frames per scenario")
+    parser.add_argument("--warmup", type=int, default=60, help="frames run before measuring")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--scenario", action="append", choices=sorted(SCENARIOS), help="run only these (repeatable)")
+    parser.add_argument("--out", default=None, help="write the JSON report here instead of stdout")
+    args = parser.parse_args()
+
+    results = {}
+    for name in args.scenario or SCENARIOS:
+        results[name] = run_scenario(name, SCENARIOS[name], args.frames, args.warmup, args.seed)
+        frame = results[name]["frame_ms"]
+        pairs = results[name]["broadphase"]
+        print(f"{name}: mean {frame['mean']:.2f} ms | p95 {frame['p95']:.2f} ms | p99 {frame['p99']:.2f} ms"
+              f" | pairs {pairs['candidate_pairs']:.0f} ({pairs['collisions']:.0f} colliding)", file=sys.stderr)
+
+    memory = entity_memory()
+    print("bytes per entity: " + ", ".join(f"{name} {size}" for name, size in memory.items()), file=sys.stderr)
+
+    report = {"meta": metadata(args.frames, args.warmup, args.seed), "results": results, "memory": memory}
+    text = json.dumps(report, indent=4, sort_keys=True)
+    if args.out:
+        with open(args.out, "w") as f:
+            f.write(text)
+    else:
+        print(text)
@@ -1,19 +1,25 @@
+import time
+_IMPORT_START = time.perf_counter()  # Startup report: from the first import to the first frame
+
 import pygame
 import os
 import sys
 import random
 import json
-from cryptography.fernet import Fernet
+from collections import OrderedDict
 from pathlib import Path
+from types import SimpleNamespace
 import hashlib
+import struct
+import zlib
+import threading
+import numpy
 
 # === DIR ====
 BASE_DIR = Path(__file__).resolve().parent
 DATA_DIR = BASE_DIR / "data"
 ASSETS_DIR = BASE_DIR / "assets"
-
-DATA_DIR.mkdir(exist_ok=True)
-ASSETS_DIR.mkdir(exist_ok=True)
+# DATA_DIR is created by the first write into it, not on import
 
 
 # Function to get the correct path for assets
@@ -26,14 +32,87 @@ def resource_path(relative_path):
 
 # === INIT ===
 
-# pygame init
-pygame.init()
+# Headless: no window, simulation only (servers, tests, fast-forward)
+HEADLESS = os.environ.get("QUICKDRAW_HEADLESS") == "1"
+HEADLESS_SIZE = (1280, 720)
+if HEADLESS:
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+# === STARTUP ===
+# No blanket pygame.init(): each slow piece of setup is a named phase that runs on first use
+# (display, fonts, audio, crypto, assets) and is timed. QUICKDRAW_STARTUP_REPORT=1 prints the
+# time to the first presented frame, split by phase.
+STARTUP_REPORT = os.environ.get("QUICKDRAW_STARTUP_REPORT") == "1"
+
+
+class Startup:
+    """ Runs each startup phase once and keeps how long it took """
+    def __init__(self, start=None):
+        self.start = time.perf_counter() if start is None else start
+        self.phases = {}   # name -> seconds, in the order they first ran
+        self.first_frame = None
+        self._results = {}
+        self._lock = threading.RLock()  # The first save may come from the save thread
+
+    def run(self, name, init):
+        """ init() the first time, its cached result after that """
+        with self._lock:
+            if name not in self._results:
+                start = time.perf_counter()
+                self._results[name] = init()
+                self.add(name, time.perf_counter() - start)
+            return self._results[name]
+
+    def add(self, name, seconds):
+        # For phases made of many small pieces, like the assets
+        self.phases[name] = self.phases.get(name, 0.0) + seconds
+
+    def frame_presented(self):
+        if self.first_frame is not None:
+            return
+        self.first_frame = time.perf_counter() - self.start
+        if STARTUP_REPORT:
+            self.print_report()
+
+    def print_report(self):
+        total = self.first_frame if self.first_frame is not None else time.perf_counter() - self.start
+        print(f"Startup: first frame after {total * 1000:.1f} ms")
+        for name, seconds in self.phases.items():
+            print(f"  {name:<10}{seconds * 1000:>8.1f} ms")
+        other = total - sum(self.phases.values())
+        print(f"  {'other':<10}{other * 1000:>8.1f} ms  (game modules, menu)")
+
+
+STARTUP = Startup(_IMPORT_START)
+# pygame and NumPy: what config imports before anything else can run
+STARTUP.add("imports", time.perf_counter() - _IMPORT_START)
+
+
+def init_audio():
+    """ The audio phase, run by the first sound. False when there is no audio device """
+    def init():
+        try:
+            pygame.mixer.init()
+        except pygame.error as e:
+            print(f"No audio: {e}")
+            return False
+        return True
+    return STARTUP.run("audio", init)
+
+
+def crypto():
+    """ The crypto phase: cryptography is imported by the first save or load, not at startup """
+    def load():
+        from cryptography.fernet import Fernet
+        from cryptography.exceptions import InvalidTag
+        from cryptography.hazmat.primitives.ciphers.aead import AESGCM
+        return SimpleNamespace(Fernet=Fernet, InvalidTag=InvalidTag, AESGCM=AESGCM)
+    return STARTUP.run("crypto", load)
+
 
 # Set Theme
-pygame.display.set_caption("Quick Draw: Outlaw Rush")
 ICON_PATH = resource_path(ASSETS_DIR / "icon.png")
-ICON = pygame.image.load(ICON_PATH)  # Load icon image
-pygame.display.set_icon(ICON)  # Set as window icon
 
 # Set Colors
 WHITE = (255, 255, 255)  # No hue, neutral color
@@ -54,36 +133,181 @@ DARK_GRAY = (64, 64, 64)  # Neutral
 DESERT = (193, 154, 107)  # Hue: ~30°
 
 # Swaps Color
-def swap_color(surface, old_color, new_color):
-    surface = surface.copy()
-    width, height = surface.get_size()
+PALETTE_CACHE_BYTES = 8 * 1024 * 1024  # Memory bound for recolored surfaces
+_PALETTE_CACHE = OrderedDict()  # (id(source), mapping) -> (source, recolored), LRU order
+_palette_bytes = 0
+
+def _surface_bytes(surface):
+    return surface.get_width() * surface.get_height() * surface.get_bytesize()
+
+def _palette_key(mapping):
+    return tuple(sorted((tuple(old[:3]), tuple(new)) for old, new in mapping.items()))
+
+def palette_swap(surface, mapping):
+    """ Recolor a surface with {old_rgb: new_color} in one pass, memoized per (surface, mapping) """
+    global _palette_bytes
+    key = (id(surface), _palette_key(mapping))
+    cached = _PALETTE_CACHE.get(key)
+    if cached is not None and cached[0] is surface:
+        _PALETTE_CACHE.move_to_end(key)
+        return cached[1]
+
+    if surface.get_bitsize() in (24, 32):
+        result = surface.copy()
+    else:
+        result = pygame.Surface(surface.get_size(), pygame.SRCALPHA, 32)
+        result.blit(surface, (0, 0))
 
-    for x in range(width):
-        for y in range(height):
-            current_color = surface.get_at((x, y))
-            if current_color[:3] == old_color:
-                surface.set_at((x, y), new_color)
+    _palette_swap_arrays(result, key[1])
 
-    return surface
+    size = _surface_bytes(surface) + _surface_bytes(result)
+    if size > PALETTE_CACHE_BYTES:
+        return result  # Too big to ever fit, don't evict everything for it
+
+    # Keep the source alive with the result so its id can't be reused while cached
+    stale = _PALETTE_CACHE.pop(key, None)
+    if stale is not None:
+        _palette_bytes -= _surface_bytes(stale[0]) + _surface_bytes(stale[1])
+    _PALETTE_CACHE[key] = (surface, result)
+    _palette_bytes += size
+    while _palette_bytes > PALETTE_CACHE_BYTES:
+        _, (old_source, old_result) = _PALETTE_CACHE.popitem(last=False)
+        _palette_bytes -= _surface_bytes(old_source) + _surface_bytes(old_result)
+    return result
+
+def _palette_swap_arrays(surface, mapping):
+    rgb = pygame.surfarray.pixels3d(surface)
+    packed = (rgb[..., 0].astype(numpy.uint32) << 16) | (rgb[..., 1].astype(numpy.uint32) << 8) | rgb[..., 2]
+
+    olds = numpy.array([(r << 16) | (g << 8) | b for (r, g, b), _ in mapping], dtype=numpy.uint32)
+    order = numpy.argsort(olds)
+    olds = olds[order]
+    news = [mapping[i][1] for i in order]
+
+    # Every pixel looks up its color in the sorted table at once
+    index = numpy.searchsorted(olds, packed).clip(0, len(olds) - 1)
+    hit = olds[index] == packed
+    rgb[hit] = numpy.array([n[:3] for n in news], dtype=numpy.uint8)[index[hit]]
+
+    if any(len(n) == 4 for n in news) and surface.get_flags() & pygame.SRCALPHA:
+        alpha = pygame.surfarray.pixels_alpha(surface)
+        new_alpha = numpy.array([n[3] if len(n) == 4 else 255 for n in news], dtype=numpy.uint8)
+        has_alpha = numpy.array([len(n) == 4 for n in news])
+        mask = hit & has_alpha[index]
+        alpha[mask] = new_alpha[index[mask]]
+        del alpha
+    del rgb  # Release the surface lock
+
+def swap_color(surface, old_color, new_color):
+    return palette_swap(surface, {old_color: new_color})
+
+def clear_palette_cache():
+    global _palette_bytes
+    _PALETTE_CACHE.clear()
+    _palette_bytes = 0
 
 # Set Fonts
-FONT = pygame.font.Font(None, 50)
 FONT_PATH = resource_path(ASSETS_DIR / "WEST____.TTF")
+TEXT_CACHE_BYTES = 4 * 1024 * 1024  # Memory bound for rendered text surfaces
+
+_FONTS = {}
+
+def get_font(path, size):
+    """ Return a shared Font for (path, size), loading the TTF only once """
+    key = (str(path) if path else None, size)
+    font = _FONTS.get(key)
+    if font is None:
+        # The fonts phase: font module init and every TTF load
+        start = time.perf_counter()
+        if not pygame.font.get_init():
+            pygame.font.init()
+        font = pygame.font.Font(path, size)
+        _FONTS[key] = font
+        STARTUP.add("fonts", time.perf_counter() - start)
+    return font
+
+
+class TextCache:
+    """ LRU cache of rendered text surfaces keyed by (text, font, color) """
+    def __init__(self, max_bytes=TEXT_CACHE_BYTES):
+        self.max_bytes = max_bytes
+        self.used_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self._surfaces = OrderedDict()
+
+    def render(self, text, font, color, antialias=True):
+        key = (text, font, tuple(color), antialias)
+        surface = self._surfaces.get(key)
+        if surface is not None:
+            self._surfaces.move_to_end(key)
+            self.hits += 1
+            return surface
+
+        self.misses += 1
+        surface = font.render(text, antialias, color)
+        size = surface.get_width() * surface.get_height() * surface.get_bytesize()
+        if size > self.max_bytes:
+            return surface  # Too big to ever fit, don't evict everything for it
+
+        self._surfaces[key] = surface
+        self.used_bytes += size
+        while self.used_bytes > self.max_bytes:
+            _, old = self._surfaces.popitem(last=False)
+            self.used_bytes -= old.get_width() * old.get_height() * old.get_bytesize()
+        return surface
+
+    def clear(self):
+        self._surfaces.clear()
+        self.used_bytes = 0
+
+    def stats(self):
+        return {
+            "entries": len(self._surfaces),
+            "bytes": self.used_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+        }
+
+
+TEXT_CACHE = TextCache()
 
 MARGIN = 10
 PADDING = 10
 
-# Set Sfx
-# shoot = resource_path("assets/sound/gunshot.mp3")
-# buzzer = resource_path("assets/sound/buzzer.wav")
-# shoot_sound = pygame.mixer.Sound(shoot)  # Placeholder sound
-# buzzer_sound = pygame.mixer.Sound(buzzer) # Placeholder sound
+# Set Sfx: decoded and played by audio.py (SFX)
 
 
 # Set Screen
-INFO = pygame.display.Info()
-SC_W, SC_H = INFO.current_w, INFO.current_h
-SCREEN = pygame.display.set_mode((SC_W , SC_H), pygame.FULLSCREEN)
+def open_display():
+    """ The display phase: video init, window, caption and icon """
+    pygame.display.init()  # Events, keyboard and mouse need it even headless
+    if HEADLESS:
+        # Offscreen surface, nothing is ever shown
+        return pygame.Surface(HEADLESS_SIZE)
+    pygame.display.set_caption("Quick Draw: Outlaw Rush")
+    pygame.display.set_icon(pygame.image.load(ICON_PATH))
+    info = pygame.display.Info()
+    return pygame.display.set_mode((info.current_w, info.current_h), pygame.FULLSCREEN)
+
+
+# Every module draws on SCREEN and sizes itself from SC_W x SC_H when imported, so this phase can't wait
+SCREEN = STARTUP.run("display", open_display)
+SC_W, SC_H = SCREEN.get_size()
+
+
+# === CLOCK ===
+_sim_clock = None
+
+def get_ticks():
+    # Game time in ms: wall clock since startup, or the simulation clock when one is installed.
+    # Not pygame.time.get_ticks(), which stays at 0 until something starts SDL's timer
+    return _sim_clock() if _sim_clock else int((time.perf_counter() - STARTUP.start) * 1000)
+
+def set_sim_clock(clock):
+    # clock: () -> ms, or None to go back to the wall clock
+    global _sim_clock
+    _sim_clock = clock
 
 
 # World Building
@@ -93,12 +317,121 @@ WORLD_SIZE = 2500
 MAX_ENEMIES = 50
 SPAWN_INTERVAL = 1.0  # seconds
 
+# Simulation runs at a fixed rate, rendering at the display's
+SIM_HZ = 60
+MAX_SIM_STEPS = 5  # Catch-up ticks per frame before the backlog is dropped
+
+
+def display_refresh_rate(default=60):
+    get_rate = getattr(pygame.display, "get_current_refresh_rate", None)  # pygame 2.2+
+    rate = get_rate() if get_rate else 0
+    return rate or default
+
+def lerp_rect(rect, prev, alpha):
+    # Where to draw rect between the previous tick (prev topleft) and the current one
+    if prev is None or alpha >= 1.0:
+        return rect
+    t = 1.0 - alpha
+    return rect.move(round((prev[0] - rect.x) * t), round((prev[1] - rect.y) * t))
+
 
 # === SAVE and LOAD ===
+# Field kinds for Serializable.fields
+PLAIN = None               # int, float, str, bool, None
+RECT = "Rect"
+VECTOR2 = "Vector2"
+COLOR = "Color"            # pygame.Color
+TUPLE = "tuple"            # e.g. RGB colors kept as tuples
+SET = "set"
+VECTOR_LIST = "VectorList"
+
+class ListOf:
+    """ Field kind: list of another Serializable class, looked up by name when decoding """
+    def __init__(self, name):
+        self.name = name
+
+class Nested:
+    """ Field kind: one object of another Serializable class, or None """
+    def __init__(self, name):
+        self.name = name
+
+_MISSING = object()
+
+def _list_items(value):
+    # Older saves wrote an empty list of objects as an empty VectorList
+    return value["value"] if isinstance(value, dict) else value
+
+# (encode expression for obj.<name>, decode expression of the saved value v)
+_FIELD_CODECS = {
+    PLAIN: ("obj.{name}", "v"),
+    RECT: ('{{"___type___": "Rect", "value": list(obj.{name})}}', 'Rect(v["value"])'),
+    VECTOR2: ('{{"___type___": "Vector2", "value": list(obj.{name})}}', 'Vector2(v["value"])'),
+    COLOR: ('{{"___type___": "Color", "value": list(obj.{name})}}', 'Color(*v["value"])'),
+    TUPLE: ("obj.{name}", "tuple(v)"),
+    SET: ("list(obj.{name})", "set(v)"),
+    VECTOR_LIST: ('{{"___type___": "VectorList", "value": [[p.x, p.y] for p in obj.{name}]}}',
+                  '[Vector2(p) for p in v["value"]]'),
+}
+
+def compile_codecs(cls):
+    """ Generate encode(obj) -> dict and decode(cls, data) -> obj from cls.fields """
+    encode = ["def encode(obj):", "    return {"]
+    decode = ["def decode(cls, data):", "    obj = cls.__new__(cls)"]
+    for name, kind in cls.fields.items():
+        if isinstance(kind, ListOf):
+            enc = "[x.to_dict() for x in obj.{name}]"
+            dec = "[Serializable.classes[{cls!r}].from_dict(x) for x in _list_items(v)]"
+        elif isinstance(kind, Nested):
+            enc = "None if obj.{name} is None else obj.{name}.to_dict()"
+            dec = "None if v is None else Serializable.classes[{cls!r}].from_dict(v)"
+        else:
+            enc, dec = _FIELD_CODECS[kind]
+        encode.append(f"        {name!r}: {enc.format(name=name)},")
+        # Fields missing from older saves are left unset, as before
+        decode.append(f"    v = data.get({name!r}, _MISSING)")
+        decode.append(f"    if v is not _MISSING:")
+        decode.append(f"        obj.{name} = {dec.format(cls=getattr(kind, 'name', None))}")
+    encode.append("    }")
+    decode.append("    return obj")
+
+    namespace = {
+        "Rect": pygame.Rect, "Vector2": pygame.Vector2, "Color": pygame.Color,
+        "Serializable": Serializable, "_MISSING": _MISSING, "_list_items": _list_items,
+    }
+    exec(compile("\n".join(encode + decode), f"<codecs {cls.__name__}>", "exec"), namespace)
+    return namespace["encode"], namespace["decode"]
+
+
+def _attributes(obj):
+    # Instance __dict__ plus every slot that is set
+    attributes = dict(getattr(obj, "__dict__", ()))
+    for klass in type(obj).__mro__:
+        for name in klass.__dict__.get("__slots__", ()):
+            if name not in attributes and hasattr(obj, name):
+                attributes[name] = getattr(obj, name)
+    return attributes
+
+
 class Serializable:
+    """ Subclasses declare fields = {attribute: kind} to get generated codecs,
+    otherwise every public attribute is saved by reflection. Works with __slots__ classes """
+    __slots__ = ()
+    classes = {}   # name -> class, for ListOf and Nested
+    fields = None
+    _encode = None
+    _decode = None
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        Serializable.classes[cls.__name__] = cls
+        if "fields" in cls.__dict__ and cls.fields is not None:
+            cls._encode, cls._decode = compile_codecs(cls)
+
     def to_dict(self):
+        if self._encode:
+            return self._encode()
         data = {}
-        for key, value in self.__dict__.items():
+        for key, value in _attributes(self).items():
             if key.startswith("_") or callable(value):
                 continue
             if isinstance(value, pygame.Rect):
@@ -119,6 +452,8 @@ class Serializable:
 
     @classmethod
     def from_dict(cls, data):
+        if cls._decode:
+            return cls._decode(cls, data)
         obj = cls.__new__(cls)  # create an uninitialized instance
         for key, value in data.items():
             if isinstance(value, dict) and "___type___" in value:
@@ -157,56 +492,114 @@ class GameEncoder(json.JSONEncoder):
         return super().default(obj)
 
 # === Only generate once! ===
+# The save thread and the autosave journal thread can both be first to need the key: without the lock
+# each would generate one, and a save encrypted under the overwritten key could never be read again
+_KEY_LOCK = threading.Lock()
+
 def generate_key():
-    key = Fernet.generate_key()
-    with open(save_key, "wb") as f:
-        f.write(key)
+    key = crypto().Fernet.generate_key()
+    write_atomic(save_key, key)
 
 def load_key():
-    return open(save_key, "rb").read()
+    with _KEY_LOCK:
+        if not os.path.exists(save_key):
+            generate_key()
+        with open(save_key, "rb") as f:
+            return f.read()
 
-def encrypt_save(data, filename=save_path):
+# Save file v2: [header][section table][nonce][AES-GCM(sections)]
+# The header and table are authenticated as associated data, the GCM tag replaces the old SHA-256
+SAVE_MAGIC = b"QDSV"
+SAVE_VERSION = 2
+SAVE_CODEC_JSON_ZLIB = 1
+SAVE_CODEC_BYTES_ZLIB = 2  # Sections that pack themselves (e.g. enemy bullets)
+SAVE_COMPRESSION = 1  # zlib level, saves happen mid-game so favour speed
+SAVE_NONCE_SIZE = 12
+_SAVE_HEADER = struct.Struct("<4sBBH")    # magic, version, flags, section count
+_SAVE_SECTION = struct.Struct("<16sBII")  # name, codec, raw size, stored size
+
+_save_ciphers = {}
+
+def save_cipher():
+    # AES-256-GCM key derived from the save key, kept apart from the key Fernet uses
     key = load_key()
-    fernet = Fernet(key)
-    # Step 2: Serialize data (player, spawner, items)
-    json_str = json.dumps(data, cls=GameEncoder)
-    # Step 3: Calculate hash
-    hash_digest = hashlib.sha256(json_str.encode()).hexdigest()
-    # Step 4: Create container dict
-    container = {
-        "hash": hash_digest,
-        "data": data
-    }
-    # Step 5: Serialize container
-    container_str = json.dumps(container)
-    # Step 6: Encrypt container string
-    encrypted = fernet.encrypt(container_str.encode())
-    
-    with open(filename, "wb") as f:
-        f.write(encrypted)
+    cipher = _save_ciphers.get(key)
+    if cipher is None:
+        cipher = _save_ciphers[key] = crypto().AESGCM(hashlib.sha256(b"quickdraw-save-v2" + key).digest())
+    return cipher
 
+def encrypt_save(data, filename=save_path):
+    # One section per top-level entry, each compressed on its own. bytes are stored as they are
+    table = []
+    sections = []
+    for name, value in data.items():
+        if isinstance(value, bytes):
+            codec, raw = SAVE_CODEC_BYTES_ZLIB, value
+        else:
+            codec, raw = SAVE_CODEC_JSON_ZLIB, json.dumps(value, cls=GameEncoder, separators=(",", ":")).encode()
+        stored = zlib.compress(raw, SAVE_COMPRESSION)
+        table.append(_SAVE_SECTION.pack(name.encode(), codec, len(raw), len(stored)))
+        sections.append(stored)
 
-def decrypt_load(filename=save_path):
-    try:
-        key = load_key()
-        fernet = Fernet(key)
+    header = _SAVE_HEADER.pack(SAVE_MAGIC, SAVE_VERSION, 0, len(table)) + b"".join(table)
+    nonce = os.urandom(SAVE_NONCE_SIZE)
+    encrypted = save_cipher().encrypt(nonce, b"".join(sections), header)
+    write_atomic(filename, header + nonce + encrypted)
 
-        with open(filename, "rb") as f:
-            encrypted = f.read()
 
-        decrypted = fernet.decrypt(encrypted)
-        container_str = decrypted.decode()
+def write_atomic(filename, blob):
+    # Temp file + rename: a crash leaves either the old file or the new one, never half of each
+    Path(filename).parent.mkdir(exist_ok=True)
+    temp = f"{filename}.tmp"
+    with open(temp, "wb") as f:
+        f.write(blob)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(temp, filename)
+
+
+def read_save_header(blob):
+    """ Parse a v2 header: returns (version, flags, [(name, codec, raw size, stored size)], header size) """
+    magic, version, flags, count = _SAVE_HEADER.unpack_from(blob)
+    if magic != SAVE_MAGIC:
+        raise ValueError("Not a save file")
+    if version > SAVE_VERSION:
+        raise ValueError(f"Save file version {version} is newer than this game")
+
+    table = []
+    offset = _SAVE_HEADER.size
+    for _ in range(count):
+        name, codec, raw_size, stored_size = _SAVE_SECTION.unpack_from(blob, offset)
+        table.append((name.rstrip(b"\0").decode(), codec, raw_size, stored_size))
+        offset += _SAVE_SECTION.size
+    return version, flags, table, offset
+
 
-        container = json.loads(container_str)
-        saved_hash = container.get("hash")
-        data = container.get("data")
+def decrypt_load(filename=save_path):
+    try:
+        with open(filename, "rb") as f:
+            blob = f.read()
 
-        # Recalculate hash on data
-        recalculated_hash = hashlib.sha256(json.dumps(data, cls=GameEncoder).encode()).hexdigest()
+        if not blob.startswith(SAVE_MAGIC):
+            return decrypt_load_legacy(blob)
 
-        if saved_hash != recalculated_hash:
+        version, flags, table, offset = read_save_header(blob)
+        nonce = blob[offset:offset + SAVE_NONCE_SIZE]
+        try:
+            payload = save_cipher().decrypt(nonce, blob[offset + SAVE_NONCE_SIZE:], blob[:offset])
+        except crypto().InvalidTag:
             raise ValueError("Save data corrupted or tampered!")
 
+        data = {}
+        start = 0
+        for name, codec, raw_size, stored_size in table:
+            if codec not in (SAVE_CODEC_JSON_ZLIB, SAVE_CODEC_BYTES_ZLIB):
+                raise ValueError(f"Unknown codec {codec} for section '{name}'")
+            raw = zlib.decompress(payload[start:start + stored_size])
+            if len(raw) != raw_size:
+                raise ValueError(f"Section '{name}' has the wrong size")
+            data[name] = json.loads(raw) if codec == SAVE_CODEC_JSON_ZLIB else raw
+            start += stored_size
         return data
 
     except Exception as e:
@@ -214,21 +607,129 @@ def decrypt_load(filename=save_path):
         raise  # or return None if you want to handle silently
 
 
-if not os.path.exists(save_key):
-    generate_key()
+def decrypt_load_legacy(encrypted):
+    # v1 saves: Fernet token of {"hash": sha256 of the data JSON, "data": ...}
+    fernet = crypto().Fernet(load_key())
+    decrypted = fernet.decrypt(encrypted)
+    container_str = decrypted.decode()
+
+    container = json.loads(container_str)
+    saved_hash = container.get("hash")
+    data = container.get("data")
 
-def save_game_data(player, spawner, items_spawn):
-    save_data = {
+    # Recalculate hash on data
+    recalculated_hash = hashlib.sha256(json.dumps(data, cls=GameEncoder).encode()).hexdigest()
+
+    if saved_hash != recalculated_hash:
+        raise ValueError("Save data corrupted or tampered!")
+
+    return data
+
+
+class SaveWorker:
+    """ Encrypts and writes saves on a background thread. Only the newest pending snapshot is written """
+    def __init__(self, write=encrypt_save):
+        self.write = write
+        self.jobs = 0
+        self._cond = threading.Condition()
+        self._pending = None   # (job, data, filename) waiting for the thread
+        self._busy = False
+        self._results = []     # (job, error or None, seconds), collected by poll()
+        self._thread = None
+        self._stopping = False
+
+    def submit(self, data, filename=save_path):
+        # data must not be touched by the game afterwards (see save_snapshot)
+        with self._cond:
+            if self._thread is None:
+                self._stopping = False
+                self._thread = threading.Thread(target=self._run, name="save-writer", daemon=True)
+                self._thread.start()
+            self.jobs += 1
+            self._pending = (self.jobs, data, filename)  # An unwritten older snapshot is superseded
+            self._cond.notify_all()
+            return self.jobs
+
+    def _run(self):
+        while True:
+            with self._cond:
+                self._cond.wait_for(lambda: self._pending is not None or self._stopping)
+                if self._pending is None:
+                    return  # Stopping and nothing left to write
+                job, data, filename = self._pending
+                self._pending = None
+                self._busy = True
+
+            start = time.perf_counter()
+            error = None
+            try:
+                self.write(data, filename)
+            except Exception as e:
+                error = e
+
+            with self._cond:
+                self._busy = False
+                self._results.append((job, error, time.perf_counter() - start))
+                self._cond.notify_all()
+
+    def poll(self):
+        # Finished saves since the last call, for the game loop to report
+        with self._cond:
+            results, self._results = self._results, []
+        return results
+
+    def wait(self, timeout=None):
+        # Barrier: returns True once nothing is pending or being written
+        with self._cond:
+            return self._cond.wait_for(lambda: self._pending is None and not self._busy, timeout)
+
+    def shutdown(self, timeout=None):
+        # Writes the last pending snapshot, then stops the thread
+        with self._cond:
+            self._stopping = True
+            self._cond.notify_all()
+        if self._thread:
+            self._thread.join(timeout)
+        self._thread = None
+
+
+SAVE_WORKER = SaveWorker()
+
+
+SAVE_ON_PAUSE = True  # Also write a background save when the game is paused
+
+
+def save_snapshot(player, spawner, items_spawn):
+    # Fresh dicts and bytes, nothing shared with the live objects, cheap enough for the main thread
+    return {
         "player": player.to_dict(),
         "spawners": spawner.to_dict(),
-        "items": items_spawn.to_dict()
+        "items": items_spawn.to_dict(),
+        "projectiles": spawner.projectiles.to_bytes(),  # Packed, thousands of bullets would dominate the JSON
     }
-    print(save_data)
-    encrypt_save(save_data)
-    print("✅ Game saved!")
+
+def save_game_data(player, spawner, items_spawn, background=True):
+    if HEADLESS:
+        # A scripted ESC or QUIT in a benchmark or CI run must not overwrite the player's save
+        return player, spawner, items_spawn
+    save_data = save_snapshot(player, spawner, items_spawn)
+    if background:
+        SAVE_WORKER.submit(save_data)
+    else:
+        encrypt_save(save_data)
+        print("✅ Game saved!")
     return player, spawner, items_spawn
 
+def report_saves():
+    # Called from the game loop: prints how background saves went
+    for job, error, seconds in SAVE_WORKER.poll():
+        if error:
+            print(f"❌ Save failed: {error}")
+        else:
+            print(f"✅ Game saved! ({seconds * 1000:.1f} ms)")
+
 def load_save_data(path=save_path):
+    SAVE_WORKER.wait()  # A save still being written would be read half done
     if not os.path.exists(path):
         print("❌ No save file found.")
         return None
@@ -252,6 +753,8 @@ def load_save_data(path=save_path):
 
 
 # === MAP ===
+_BORDER_OVERLAYS = {}  # (width, height, thickness, radius, color) -> [(surface, pos)]
+
 class BaseMap:
     def __init__(self, x, y, width, height, color, border_color=BLACK, border_size=3):
         self.posx, self.posy = x, y
@@ -272,15 +775,19 @@ class RectMap(BaseMap):
         self.pos = pygame.Vector2(x, y)
         self.rect = pygame.Rect(self.pos.x, self.pos.y, width, height)
 
-    def draw(self, camera):
+    def begin_tick(self):
+        self._prev = self.rect.topleft
+
+    def scroll(self, camera):
         self.pos = self.rect.move(-camera.offset_x, -camera.offset_y)
         self.rect.x, self.rect.y = self.pos.x, self.pos.y
 
-        pygame.draw.rect(SCREEN, self.border_color, self.rect.inflate(self.border_size*2, self.border_size*2))
-        pygame.draw.rect(SCREEN, self.color, self.rect)
+    def draw(self, alpha=1.0):
+        rect = lerp_rect(self.rect, getattr(self, "_prev", None), alpha)
+        pygame.draw.rect(SCREEN, self.border_color, rect.inflate(self.border_size*2, self.border_size*2))
+        pygame.draw.rect(SCREEN, self.color, rect)
 
-    def draw_border_overlay(self, thickness=25, radius=25, color=DESERT):
-        width, height = SC_W, SC_H
+    def build_border_overlay(self, width, height, thickness, radius, color):
         # Create transparent surface
         overlay = pygame.Surface((width, height), pygame.SRCALPHA)
         # Draw full rectangle (the border background)
@@ -307,10 +814,45 @@ class RectMap(BaseMap):
             border_radius=radius
         )
 
+        # Split into pieces so only the rounded corners need alpha blending,
+        # the straight edges are opaque strips
+        corner = min(thickness + radius + 3, width // 2, height // 2)
+        pieces = []
+        for x, y in [(0, 0), (width - corner, 0), (0, height - corner), (width - corner, height - corner)]:
+            piece = overlay.subsurface((x, y, corner, corner)).copy()
+            pieces.append((piece, (x, y)))
+
+        strips = [
+            (corner, 0, width - corner * 2, thickness),               # Top
+            (corner, height - thickness, width - corner * 2, thickness),  # Bottom
+            (0, corner, thickness, height - corner * 2),              # Left
+            (width - thickness, corner, thickness, height - corner * 2),  # Right
+        ]
+        for x, y, w, h in strips:
+            if w <= 0 or h <= 0:
+                continue
+            strip = pygame.Surface((w, h))
+            strip.blit(overlay, (0, 0), (x, y, w, h))
+            pieces.append((strip, (x, y)))
+
+        # Display format once, like the sprite atlas: blitting them every frame then needs no conversion.
+        # Headless runs have no display mode and keep them as they are
+        if pygame.display.get_surface() is not None:
+            pieces = [(piece.convert_alpha() if piece.get_flags() & pygame.SRCALPHA else piece.convert(), pos)
+                      for piece, pos in pieces]
+        return pieces
+
+    def draw_border_overlay(self, thickness=25, radius=25, color=DESERT):
+        width, height = SC_W, SC_H
+        # Built once per resolution and style, then reused every frame
+        key = (width, height, thickness, radius, tuple(color))
+        pieces = _BORDER_OVERLAYS.get(key)
+        if pieces is None:
+            pieces = _BORDER_OVERLAYS[key] = self.build_border_overlay(width, height, thickness, radius, color)
+
         # Blit overlay on SCREEN
-        SCREEN.blit(overlay, (0, 0))
+        SCREEN.blits(pieces, doreturn=False)
 
-    
     def resolve_world_bounds(self, entity, camera):
         pass
 
@@ -338,22 +880,25 @@ class Camera():
         # Convert world coordinates -> screen coordinates
         return obj_rect.move(-self.offset_x, -self.offset_y)
 
-    def camera_control(self, entity, rectmap):
-        keys = pygame.key.get_pressed()
+    def camera_control(self, entity, rectmap, dt=1 / 60, keys=None):
+        # keys: anything indexable by key code, defaults to the keyboard
+        keys = pygame.key.get_pressed() if keys is None else keys
+        # cam_spd is per 60 Hz tick
+        step = self.cam_spd * dt * 60
 
         # thrust force
         if keys[pygame.K_w]: 
             if not entity.rect.bottom > self.rect.bottom: 
-                self.cam_spd_y -= self.cam_spd
+                self.cam_spd_y -= step
         if keys[pygame.K_s]: 
             if not entity.rect.top < self.rect.top:
-                self.cam_spd_y += self.cam_spd
+                self.cam_spd_y += step
         if keys[pygame.K_a]: 
             if not entity.rect.right > self.rect.right:
-                self.cam_spd_x -= self.cam_spd
+                self.cam_spd_x -= step
         if keys[pygame.K_d]: 
             if not entity.rect.left < self.rect.left: 
-                self.cam_spd_x += self.cam_spd
+                self.cam_spd_x += step
        
 
         
@@ -363,3 +908,294 @@ class Camera():
         self.cam_spd_x = 0
         self.cam_spd_y = 0
 
+
+
+# === CULLING ===
+CULL_MARGIN = 32  # px past the screen edge, covers interpolation and health bars
+
+
+class ViewCuller:
+    """ Skips draw calls of entities outside the camera view.
+    Entity rects are screen space after scroll(), so the view is the camera rect plus a margin """
+    def __init__(self, camera, margin=CULL_MARGIN):
+        self.camera = camera
+        self.margin = margin
+        self.view = camera.rect.inflate(margin * 2, margin * 2)
+
+        # Per frame stats
+        self.drawn = 0
+        self.culled = 0
+
+    def begin_frame(self):
+        self.view = self.camera.rect.inflate(self.margin * 2, self.margin * 2)
+        self.drawn = 0
+        self.culled = 0
+
+    def visible(self, entities, bounds=None):
+        # bounds(entity) -> Rect for entities drawing past their rect, the rect itself otherwise
+        entities = list(entities)
+        rects = [bounds(e) for e in entities] if bounds else [e.rect for e in entities]
+        indices = self.view.collidelistall(rects)
+        self.tally(len(indices), len(entities))
+        return [entities[i] for i in indices]
+
+    def tally(self, drawn, total):
+        self.drawn += drawn
+        self.culled += total - drawn
+
+
+# === DIRTY RECTS ===
+DIRTY_RECTS = True        # Present only the changed parts of the screen, False = flip every frame
+DIRTY_FULL_RATIO = 0.5    # Past this share of the screen a flip is cheaper
+DIRTY_MAX_RECTS = 256
+
+
+class DirtyRenderer:
+    """ Restores last frame's sprites from a cached background and presents only the rects
+    that changed. Anything drawn over the background must be reported with mark() """
+    def __init__(self, enabled=DIRTY_RECTS, full_ratio=DIRTY_FULL_RATIO, max_rects=DIRTY_MAX_RECTS):
+        self.enabled = enabled
+        self.full_ratio = full_ratio
+        self.max_rects = max_rects
+        self.screen_rect = SCREEN.get_rect()
+        self.background = None
+        self.background_key = None
+        self.prev = []    # Drawn last frame, restored this frame
+        self.rects = []   # Drawn this frame
+        self.prev_area = 0
+        self.full = True
+
+        # Stats
+        self.full_frames = 0
+        self.partial_frames = 0
+        self.dirty_ratio = 1.0
+
+    def invalidate(self):
+        # SCREEN was drawn over behind our back: redraw and flip everything
+        self.background_key = None
+        self.full = True
+
+    def begin_frame(self, key, draw_background):
+        # key: anything that changes whenever the background does (where the map is on screen)
+        self.rects = []
+        if self.enabled and key == self.background_key and self.background is not None:
+            screen_area = self.screen_rect.w * self.screen_rect.h
+            if self.prev_area > self.full_ratio * screen_area or len(self.prev) > self.max_rects:
+                # Many overlapping rects cost more than copying the whole background once
+                SCREEN.blit(self.background, (0, 0))
+            else:
+                SCREEN.blits([(self.background, rect, rect) for rect in self.prev], doreturn=False)
+            self.full = False
+            return
+
+        draw_background()
+        self.full = True
+        # Only cached once it holds still for two frames, scrolling would copy it every frame
+        settled = self.enabled and key == self.background_key
+        self.background = SCREEN.copy() if settled else None
+        self.background_key = key
+
+    def mark(self, rect):
+        if rect is not None:
+            self.rects.append(self.screen_rect.clip(rect))
+
+    def present(self):
+        dirty = self.prev + self.rects
+        # Overlaps are counted twice, close enough to pick between the two
+        area = sum(r.w * r.h for r in self.rects)
+        if self.full:
+            self.dirty_ratio = 1.0
+        else:
+            self.dirty_ratio = (self.prev_area + area) / (self.screen_rect.w * self.screen_rect.h)
+        self.prev = self.rects
+        self.prev_area = area
+
+        full = self.full or self.dirty_ratio > self.full_ratio or len(dirty) > self.max_rects
+        if full:
+            self.full_frames += 1
+        else:
+            self.partial_frames += 1
+        if HEADLESS:
+            return  # Offscreen SCREEN, the bookkeeping above is all there is to do
+        if full:
+            pygame.display.flip()
+        else:
+            pygame.display.update(dirty)
+
+
+# === POOLING ===
+class ObjectPool:
+    """ Recycles instances of cls: acquire() calls obj.reset(*args) instead of cls(*args) """
+    def __init__(self, cls):
+        self.cls = cls
+        self.free = []
+        self.created = 0
+        self.acquired = 0
+        self.released = 0
+        self.in_use = 0
+        self.high_water = 0
+
+    def acquire(self, *args):
+        if self.free:
+            obj = self.free.pop()
+            obj.reset(*args)
+        else:
+            obj = self.cls(*args)
+            self.created += 1
+        obj._pooled = False
+        self.acquired += 1
+        self.in_use += 1
+        self.high_water = max(self.high_water, self.in_use)
+        return obj
+
+    def release(self, obj):
+        if getattr(obj, "_pooled", False):
+            return  # Already back in the pool
+        obj._pooled = True
+        self.free.append(obj)
+        self.released += 1
+        # Objects loaded from a save were never acquired
+        self.in_use = max(0, self.in_use - 1)
+
+    def prewarm(self, count, *args):
+        # Build objects ahead of time so a stage start doesn't allocate mid-fight
+        while len(self.free) < count:
+            obj = self.cls(*args)
+            obj._pooled = True
+            self.free.append(obj)
+            self.created += 1
+
+    def stats(self):
+        return {
+            "free": len(self.free),
+            "in_use": self.in_use,
+            "high_water": self.high_water,
+            "created": self.created,
+            "acquired": self.acquired,
+            "released": self.released,
+        }
+
+
+# === ENTITIES ===
+SLOT_BITS = 20
+SLOT_MASK = (1 << SLOT_BITS) - 1
+
+
+class EntityRegistry:
+    """ Dense entity storage with generational handles and a per-frame destroy queue.
+    destroy() only queues; flush() compacts once, so iterating is safe while entities
+    are created or destroyed (new ones are picked up next frame). Don't flush mid-iteration. """
+    def __init__(self):
+        self.dense = []          # Live entities, in creation order
+        self._slots = []         # dense index -> slot
+        self._index = []         # slot -> dense index (-1 when free)
+        self._generations = []   # slot -> generation, bumped on every free
+        self._free = []
+        self._pending = set()    # Slots queued for destruction
+
+        self.created = 0
+        self.destroyed = 0
+
+    def create(self, entity):
+        if self._free:
+            slot = self._free.pop()
+        else:
+            slot = len(self._index)
+            self._index.append(-1)
+            self._generations.append(0)
+
+        self._index[slot] = len(self.dense)
+        self.dense.append(entity)
+        self._slots.append(slot)
+        entity._handle = (self._generations[slot] << SLOT_BITS) | slot
+        self.created += 1
+        return entity._handle
+
+    def extend(self, entities):
+        for entity in entities:
+            self.create(entity)
+
+    def _slot(self, handle):
+        slot = handle & SLOT_MASK
+        if slot >= len(self._index) or self._generations[slot] != handle >> SLOT_BITS:
+            return None  # Stale handle, the slot was reused
+        if self._index[slot] < 0:
+            return None
+        return slot
+
+    def get(self, handle):
+        slot = self._slot(handle)
+        if slot is None or slot in self._pending:
+            return None
+        return self.dense[self._index[slot]]
+
+    def alive(self, handle):
+        return self.get(handle) is not None
+
+    def slot(self, entity):
+        # Stable for the entity's whole life, parallel arrays can use it as a row (see EnemyKinematics)
+        return entity._handle & SLOT_MASK
+
+    @property
+    def slots(self):
+        # Slot of each entity in dense, same order
+        return self._slots
+
+    def destroy(self, entity):
+        # Accepts an entity or its handle
+        handle = entity if isinstance(entity, int) else getattr(entity, "_handle", None)
+        if handle is None:
+            return
+        slot = self._slot(handle)
+        if slot is not None:
+            self._pending.add(slot)
+
+    def flush(self):
+        # One compaction pass for everything destroyed this frame
+        if not self._pending:
+            return []
+
+        removed = []
+        dense, slots = [], []
+        for entity, slot in zip(self.dense, self._slots):
+            if slot in self._pending:
+                removed.append(entity)
+                self._index[slot] = -1
+                self._generations[slot] += 1
+                self._free.append(slot)
+                entity._handle = None
+            else:
+                self._index[slot] = len(dense)
+                dense.append(entity)
+                slots.append(slot)
+
+        self.dense, self._slots = dense, slots
+        self._pending.clear()
+        self.destroyed += len(removed)
+        return removed
+
+    def clear(self):
+        # created/destroyed keep counting (the kill cam keys layouts on them) and every slot gets a
+        # new generation, so nothing from before the clear matches anything after it
+        for entity in self.dense:
+            entity._handle = None
+        self.destroyed += len(self.dense)
+        self.dense = []
+        self._slots = []
+        self._index = [-1] * len(self._index)
+        self._generations = [generation + 1 for generation in self._generations]
+        self._free = list(reversed(range(len(self._index))))
+        self._pending.clear()
+
+    def __iter__(self):
+        # Only entities that existed when iteration started
+        dense = self.dense
+        for i in range(len(dense)):
+            yield dense[i]
+
+    def __len__(self):
+        # Entities queued for destruction no longer count
+        return len(self.dense) - len(self._pending)
+
+    def __bool__(self):
+        return len(self) > 0
@@ -1,5 +1,7 @@
 import pygame
 from config import *
+from physics import ProjectileStore, EnemyKinematics, BULLET_LIFETIME
+from audio import SFX
 import random
 import math
 
@@ -52,6 +54,11 @@ sprite = pygame.sprite.Sprite
 #         return self.scale ** self.stage
 
 class DifficultyManager(Serializable):
+    fields = {
+        "elapsed_time": PLAIN, "stage": PLAIN, "stage_duration": PLAIN, "delay_duration": PLAIN,
+        "boss_interval": PLAIN, "state": PLAIN, "state_timer": PLAIN, "scale": PLAIN, "boss_ready": PLAIN,
+    }
+
     def __init__(self):
         self.elapsed_time = 0.0
         self.stage = 0
@@ -101,36 +108,47 @@ class DifficultyManager(Serializable):
         # Calculation: scale ^ stage
         return self.scale ** self.stage
 
-    def draw(self):
+    def remaining_time(self):
+        # Show time REMAINING in the stage if Active, otherwise show Delay timer
+        if self.state == "ACTIVE":
+            return max(0, self.stage_duration - self.state_timer)
+        return max(0, self.delay_duration - self.state_timer)
+
+    def build_hud(self):
         # Position and Container (Keep your existing code)
         x, y = SC_W//2 - 100, 10
         width, height = 200, 50
-        
-        # Change color based on state (Visual feedback)
-        bg_color = DESERT if self.state == "ACTIVE" else (200, 200, 200)
-        time_container = Container(x=x, y=y, width=width, height=height, color=bg_color)
-        time_container.draw_rect(SCREEN)
+        font = get_font(FONT_PATH, 36)
+        hud = Hud()
 
-        font = pygame.font.Font(FONT_PATH, 36)
-        
-        # Show time REMAINING in the stage if Active, otherwise show Delay timer
-        if self.state == "ACTIVE":
-            display_time = max(0, self.stage_duration - self.state_timer)
-        else:
-            display_time = max(0, self.delay_duration - self.state_timer)
-            
-        total_seconds = int(display_time)
-        time_text = f"{total_seconds // 60:02d}:{total_seconds % 60:02d}"
+        def timer_value():
+            total_seconds = int(self.remaining_time())
+            return self.state, f"{total_seconds // 60:02d}:{total_seconds % 60:02d}"
 
-        text_surface = font.render(time_text, True, BLACK)
-        text_rect = text_surface.get_rect(center=(x + width // 2, y + height // 2))
-        SCREEN.blit(text_surface, text_rect)
+        def render_timer(surface, value):
+            state, time_text = value
+            # Change color based on state (Visual feedback)
+            bg_color = DESERT if state == "ACTIVE" else (200, 200, 200)
+            border = 3
+            time_container = Container(x=border, y=border, width=width, height=height, color=bg_color, border_size=border)
+            time_container.draw_rect(surface=surface)
+            text_surface = TEXT_CACHE.render(time_text, font, BLACK)
+            surface.blit(text_surface, text_surface.get_rect(center=time_container.rect.center))
+
+        hud.add_widget(HudWidget((x - 3, y - 3, width + 6, height + 6), timer_value, render_timer))
 
         # Show current stage
-        level_text = f"Stage {self.stage}" if self.state == "ACTIVE" else "GET READY!"
-        level_surface = font.render(level_text, True, BLACK)
-        level_rect = level_surface.get_rect(midtop=(x + width // 2, y + height + 5))
-        SCREEN.blit(level_surface, level_rect)
+        level_rect = pygame.Rect(0, 0, width + 100, font.get_linesize())
+        level_rect.midtop = (x + width // 2, y + height + 5)
+        level_value = lambda: f"Stage {self.stage}" if self.state == "ACTIVE" else "GET READY!"
+        hud.add_widget(HudWidget(level_rect, level_value, hud_text(36, anchor="midtop")))
+        return hud
+
+    def draw(self):
+        hud = getattr(self, "_hud", None)
+        if hud is None:
+            hud = self._hud = self.build_hud()
+        return hud.draw()
 
 class Button:
     def __init__(self, x, y, width, height, text, color, text_color, action=None, 
@@ -154,10 +172,10 @@ class Button:
         pygame.draw.rect(SCREEN, color, self.rect, border_radius=8)
 
         # Load font (custom or default)
-        font = pygame.font.Font(self.font_path, self.font_size) if self.font_path else pygame.font.Font(None, self.font_size)
+        font = get_font(self.font_path, self.font_size)
         
         # Render text
-        text_surface = font.render(self.text, True, self.text_color)
+        text_surface = TEXT_CACHE.render(self.text, font, self.text_color)
         text_rect = text_surface.get_rect(center=self.rect.center)
         SCREEN.blit(text_surface, text_rect)
 
@@ -175,10 +193,12 @@ class Container:
         self.border_color = border_color
         self.border_size = border_size
 
-    def draw_rect(self, hover=False):
+    def draw_rect(self, hover=False, surface=None, offset=(0, 0)):
         # color = (255, 50, 50) if hover else self.color
-        pygame.draw.rect(SCREEN, self.border_color, self.rect.inflate(self.border_size * 2, self.border_size * 2), border_radius=8)
-        pygame.draw.rect(SCREEN, self.color, self.rect, border_radius=8)
+        surface = SCREEN if surface is None else surface
+        rect = self.rect.move(offset)
+        pygame.draw.rect(surface, self.border_color, rect.inflate(self.border_size * 2, self.border_size * 2), border_radius=8)
+        pygame.draw.rect(surface, self.color, rect, border_radius=8)
 
     def draw_circle(self, camera_offset, center_x, center_y):
         pygame.draw.circle(SCREEN, (255, 255, 255), (int(center_x), int(center_y)), WORLD_RADIUS)
@@ -198,17 +218,117 @@ class Container:
         # Blit overlay with transparency
         SCREEN.blit(overlay, (self.posx, self.posy))
 
+# === HUD ===
+def hud_text(font_size, color=BLACK, anchor="center"):
+    # Widget renderer that draws its value as text anchored inside the widget
+    font = get_font(FONT_PATH, font_size)
+
+    def render(surface, text):
+        text_surface = TEXT_CACHE.render(text, font, color)
+        area = surface.get_rect()
+        surface.blit(text_surface, text_surface.get_rect(**{anchor: getattr(area, anchor)}))
+    return render
+
+
+class HudWidget:
+    """ HUD element that re-renders its own surface only when its bound value changes """
+    def __init__(self, rect, bind, render):
+        self.rect = pygame.Rect(rect)  # Screen space
+        self.bind = bind               # () -> value shown by the widget
+        self.render = render           # (surface, value) -> None, surface is widget sized
+        self.surface = pygame.Surface(self.rect.size, pygame.SRCALPHA)
+        self.value = None
+        self.renders = 0
+        self._rendered = False
+
+    def refresh(self):
+        value = self.bind()
+        if self._rendered and value == self.value:
+            return False
+
+        self.value = value
+        self.surface.fill((0, 0, 0, 0))
+        self.render(self.surface, value)
+        self._rendered = True
+        self.renders += 1
+        return True
+
+
+class Hud:
+    """ Retained-mode overlay: chrome is drawn once, dirty widgets are recomposed, one blit per frame """
+    def __init__(self):
+        self.rect = None
+        self.chrome = []
+        self.widgets = []
+        self._chrome_surface = None
+        self._surface = None
+
+    def add_chrome(self, container):
+        self.chrome.append(container)
+        self._surface = None
+
+    def add_widget(self, widget):
+        self.widgets.append(widget)
+        self._surface = None
+
+    def build(self):
+        rects = [c.rect.inflate(c.border_size * 2, c.border_size * 2) for c in self.chrome]
+        rects += [w.rect for w in self.widgets]
+        self.rect = rects[0].unionall(rects[1:]).clip(pygame.Rect(0, 0, SC_W, SC_H))
+
+        offset = (-self.rect.x, -self.rect.y)
+        self._chrome_surface = pygame.Surface(self.rect.size, pygame.SRCALPHA)
+        for container in self.chrome:
+            container.draw_rect(surface=self._chrome_surface, offset=offset)
+
+        self._surface = self._chrome_surface.copy()
+        for widget in self.widgets:
+            widget.refresh()
+            self._surface.blit(widget.surface, widget.rect.move(offset))
+
+    def draw(self, target=None):
+        target = SCREEN if target is None else target
+        if self._surface is None:
+            self.build()
+        else:
+            offset = (-self.rect.x, -self.rect.y)
+            for widget in self.widgets:
+                if not widget.refresh():
+                    continue
+                # Restore the chrome under the widget, then lay the new render on top
+                area = widget.rect.move(offset)
+                self._surface.fill((0, 0, 0, 0), area)
+                self._surface.blit(self._chrome_surface, area, area, special_flags=pygame.BLEND_RGBA_ADD)
+                self._surface.blit(widget.surface, area)
+
+        return target.blit(self._surface, self.rect)
+
+
 class Bullet(Serializable):
+    __slots__ = ("pos", "vel", "rect", "speed", "radius", "dmg", "lifetime", "_pooled")
+    fields = {
+        "pos": VECTOR2, "vel": VECTOR2, "rect": RECT,
+        "speed": PLAIN, "radius": PLAIN, "dmg": PLAIN, "lifetime": PLAIN,
+    }
+
     def __init__(self, x, y, target, dmg):
-        self.pos = pygame.Vector2(x, y)
+        self.pos = pygame.Vector2()
+        self.vel = pygame.Vector2()
+        self.rect = pygame.Rect(0, 0, 0, 0)
+        self.reset(x, y, target, dmg)
+
+    def reset(self, x, y, target, dmg):
+        self.pos.update(x, y)
         self.speed = 400
         self.radius = 4
         self.dmg=dmg
+        self.lifetime = BULLET_LIFETIME
 
-        direction = pygame.Vector2(target) - self.pos
-        self.vel = direction.normalize() * self.speed
+        self.vel.update(target)
+        self.vel -= self.pos
+        self.vel.scale_to_length(self.speed)
 
-        self.rect = pygame.Rect(self.pos.x - self.radius, self.pos.y - self.radius, self.radius * 2, self.radius * 2)
+        self.rect.update(self.pos.x - self.radius, self.pos.y - self.radius, self.radius * 2, self.radius * 2)
 
 
     def update(self, dt):
@@ -222,11 +342,26 @@ class Bullet(Serializable):
         pygame.draw.circle(SCREEN, (255, 50, 50), (posx, posy), self.radius)
 
 class Bomb(Serializable):
+    __slots__ = (
+        "pos", "rect", "width", "height", "dmg", "blast_radius", "timer", "color", "exploded", "destroyed",
+        "_prev", "_handle", "_owner", "_pooled",
+    )
+    fields = {
+        "pos": VECTOR2, "rect": RECT, "width": PLAIN, "height": PLAIN, "dmg": PLAIN,
+        "blast_radius": PLAIN, "timer": PLAIN, "color": TUPLE, "exploded": PLAIN, "destroyed": PLAIN,
+    }
+
     def __init__(self, x, y, dmg):
+        self.pos = pygame.Vector2()
+        self.rect = pygame.Rect(0, 0, 0, 0)
+        self.reset(x, y, dmg)
+
+    def reset(self, x, y, dmg):
         # The bomb starts at a World Position
-        self.pos = pygame.Vector2(x, y)
+        self.pos.update(x, y)
         self.width, self.height = 20, 60
-        self.rect = pygame.Rect(self.pos.x, self.pos.y, self.width, self.height)
+        self.rect.update(self.pos.x, self.pos.y, self.width, self.height)
+        self._prev = None  # Drawn where it spawns, not lerped from where its last pooled life ended
 
         # === Stats ===
         self.dmg = dmg
@@ -262,21 +397,32 @@ class Bomb(Serializable):
         # Mark for removal after explosion logic finishes
         self.destroyed = True
 
-    def draw(self, camera):
+    def begin_tick(self):
+        self._prev = self.rect.topleft
+
+    def scroll(self, camera):
         # Calculate Screen Space
-        self.pos = pygame.Vector2(self.rect.x - camera.offset_x, self.rect.y - camera.offset_y)
+        self.pos.update(self.rect.x - camera.offset_x, self.rect.y - camera.offset_y)
         self.rect.x, self.rect.y = self.pos
-        
+
+    def draw_bounds(self):
+        # The blast radius outline reaches well past the bomb itself
+        return self.rect.inflate(self.blast_radius * 2, self.blast_radius * 2)
+
+    def draw(self, alpha=1.0):
+        rect = lerp_rect(self.rect, getattr(self, "_prev", None), alpha)
+
         # Pulse effect: gets redder as timer runs out
         pulse_color = (255, 0, 0, 100) # Red with alpha
-        pygame.draw.circle(SCREEN, (200, 0, 0), self.rect.center, self.blast_radius, 2) # Outline
+        outline = pygame.draw.circle(SCREEN, (200, 0, 0), rect.center, self.blast_radius, 2) # Outline
 
         # 2. Draw the Bomb itself
-        pygame.draw.rect(SCREEN, self.color, self.rect)
+        body = pygame.draw.rect(SCREEN, self.color, rect)
         
         # Optional: Draw timer text or a small red 'fuse' light
         if int(self.timer * 5) % 2 == 0: # Blinking light
-            pygame.draw.circle(SCREEN, (255, 0, 0), self.rect.center, 5)
+            pygame.draw.circle(SCREEN, (255, 0, 0), rect.center, 5)
+        return outline.union(body)
 
     def on_click(self):
         if self.destroyed:
@@ -320,6 +466,14 @@ class Bomb(Serializable):
 
 
 class Player(Serializable):
+    fields = {
+        "pos": VECTOR2, "rect": RECT, "color": TUPLE, "border_color": TUPLE, "border_size": PLAIN,
+        "max_hp": PLAIN, "hp": PLAIN, "armor": PLAIN, "max_ammo": PLAIN, "num_of_bullets": PLAIN,
+        "dmg": PLAIN, "attk_spd": PLAIN, "reload_spd": PLAIN, "crit_rate": PLAIN, "crit_dmg": PLAIN,
+        "wallet": PLAIN, "cursor": PLAIN, "shooting": PLAIN, "reloading": PLAIN,
+        "next_allowed_shot_time": PLAIN, "reload_finish_time": PLAIN, "mny_mod": PLAIN, "cam_spd": PLAIN,
+    }
+
     def __init__(self, x, y, width, height, color, border_color, border_size):
         # === Objects ===
         self.pos = pygame.Vector2(x, y)
@@ -345,69 +499,79 @@ class Player(Serializable):
         self.shooting = True
         self.reloading = False
 
-        self.next_allowed_shot_time = pygame.time.get_ticks() +  300
+        self.next_allowed_shot_time = get_ticks() +  300
         self.reload_finish_time = 0
 
         self.mny_mod = 0
         self.cam_spd = 10
 
 
-    def draw_UI(self):
+    def build_hud(self):
+        hud = Hud()
         profile_rect = Container(x = SC_W//2 - 250, y= SC_H - (64+(PADDING*2)), width=500, height=250, color=WHITE)
-        profile_rect.draw_rect()
+        hud.add_chrome(profile_rect)
 
         # Wallet container (bottom-left)
         wallet_x = profile_rect.rect.right - (64+PADDING)
         wallet_y = profile_rect.rect.top + PADDING
         wallet_container = Container(x=wallet_x, y=wallet_y, width=64, height=64, color=DESERT)
-        wallet_container.draw_rect()
+        hud.add_chrome(wallet_container)
 
         # Gun chamber
         chamber_x = profile_rect.rect.centerx - 150
         chamber_y = SC_H - 150
         chamber_container = Container(x=chamber_x, y=chamber_y, width=300, height=300, color=WHITE)
-        chamber_container.draw_rect()
+        hud.add_chrome(chamber_container)
 
         # Ammo container (top-left)
         ammo_x = profile_rect.rect.left + PADDING
         ammo_y = profile_rect.rect.top + PADDING
         ammo_container = Container(x=ammo_x, y=ammo_y, width=64, height=64, color=DESERT)
-        ammo_container.draw_rect()
-
-        # Fonts
-        font = pygame.font.Font(FONT_PATH, 32)
+        hud.add_chrome(ammo_container)
 
+        # Text is allowed to overflow its 64px box, so widgets are wider than the box
         # --- Draw Wallet ---
-        wallet = getattr(self, "wallet", 0)
-        wallet_text = font.render(f"{wallet}$", True, BLACK)
-        wallet_rect = wallet_text.get_rect(center=(wallet_x + wallet_container.width // 2, wallet_y + wallet_container.height // 2))
-        SCREEN.blit(wallet_text, wallet_rect)
+        wallet_rect = pygame.Rect(0, 0, 128, 64)
+        wallet_rect.center = wallet_container.rect.center
+        wallet_value = lambda: f"{getattr(self, 'wallet', 0)}$"
+        hud.add_widget(HudWidget(wallet_rect, wallet_value, hud_text(32)))
 
         # --- Draw Ammo ---
-        ammo = getattr(self, "max_ammo", 0)
-        bullets = getattr(self, "num_of_bullets", 0)
-        ammo_text = font.render(f"{bullets}/{ammo}", True, BLACK)
-        ammo_rect = ammo_text.get_rect(center=(ammo_x + ammo_container.width // 2, ammo_y + ammo_container.height // 2))
-        SCREEN.blit(ammo_text, ammo_rect)
+        ammo_rect = pygame.Rect(0, 0, 128, 64)
+        ammo_rect.center = ammo_container.rect.center
+        ammo_value = lambda: f"{getattr(self, 'num_of_bullets', 0)}/{getattr(self, 'max_ammo', 0)}"
+        hud.add_widget(HudWidget(ammo_rect, ammo_value, hud_text(32)))
+        return hud
 
-    def draw_Object(self, rectmap):
+    def draw_UI(self):
+        hud = getattr(self, "_hud", None)
+        if hud is None:
+            hud = self._hud = self.build_hud()
+        return hud.draw()
+
+    def begin_tick(self):
+        self._prev = self.rect.topleft
+
+    def follow(self, rectmap):
         self.pos = pygame.Vector2(rectmap.rect.centerx, rectmap.rect.centery)
         self.rect.x, self.rect.y = self.pos
 
-        pygame.draw.rect(SCREEN, self.border_color, self.rect.inflate(self.border_size * 2, self.border_size * 2), border_radius=8)
-        pygame.draw.rect(SCREEN, self.color, self.rect, border_radius=8)
+    def draw_Object(self, alpha=1.0):
+        rect = lerp_rect(self.rect, getattr(self, "_prev", None), alpha)
+        body = pygame.draw.rect(SCREEN, self.border_color, rect.inflate(self.border_size * 2, self.border_size * 2), border_radius=8)
+        pygame.draw.rect(SCREEN, self.color, rect, border_radius=8)
 
 
-        font = pygame.font.Font(FONT_PATH, 20)
-        hp_txt = f"{self.hp}/{self.max_hp}"
-        text_surface = font.render(hp_txt, True, BLACK)
-        text_rect = text_surface.get_rect(
-        center=(self.rect.centerx, self.rect.bottom + 20)
-        )
-        SCREEN.blit(text_surface, text_rect)
+        hp_label = getattr(self, "_hp_label", None)
+        if hp_label is None:
+            hp_value = lambda: f"{self.hp}/{self.max_hp}"
+            hp_label = self._hp_label = HudWidget((0, 0, 200, 30), hp_value, hud_text(20))
+        hp_label.refresh()
+        hp_label.rect.center = (rect.centerx, rect.bottom + 20)
+        return body.union(SCREEN.blit(hp_label.surface, hp_label.rect))
 
     def update(self, events):
-        now = pygame.time.get_ticks()
+        now = get_ticks()
         # Finish reload
         if self.reloading and now >= self.reload_finish_time:
             self.num_of_bullets = self.max_ammo
@@ -416,16 +580,16 @@ class Player(Serializable):
 
         for event in events:
             if event.type == pygame.MOUSEBUTTONDOWN and event.button == 1:
-                return self.shoot()
+                return self.shoot(event.pos)
             
             if event.type == pygame.KEYDOWN and event.key == pygame.K_r:
                 self.start_reload()
 
         return None, 0
         
-    def shoot(self):
-        now = pygame.time.get_ticks()
-        mx, my = pygame.mouse.get_pos()
+    def shoot(self, pos=None):
+        now = get_ticks()
+        mx, my = pygame.mouse.get_pos() if pos is None else pos
         hit_pos = pygame.Vector2(mx , my)
 
         if self.reloading:
@@ -435,11 +599,13 @@ class Player(Serializable):
             return None, 0
 
         if self.num_of_bullets <= 0:
+            SFX.play("empty")
             self.start_reload()
             return None, 0
 
         self.num_of_bullets -= 1
         self.next_allowed_shot_time = now + int(1000 / self.attk_spd)
+        SFX.play("shoot")
         print("Shot")
 
         is_crit = random.random() < self.crit_rate  # crit_rate = 0.0 to 1.0
@@ -453,7 +619,7 @@ class Player(Serializable):
 
         print("Reloading...")
         self.reloading = True
-        self.reload_finish_time = pygame.time.get_ticks() + int(1000 / self.reload_spd)
+        self.reload_finish_time = get_ticks() + int(1000 / self.reload_spd)
 
     def gain_reward(self, reward):
         self.wallet += (reward + self.mny_mod)
@@ -464,11 +630,59 @@ class Player(Serializable):
             self.destroyed = True
 
 
+# Range enemies keep to a band around the player
+DESIRED_RADIUS = 250
+TOLERANCE = 10
+
+
+class BomberState(Serializable):
+    """ Teleport -> wait -> plant a bomb -> cooldown cycle, only bombers carry one """
+    __slots__ = ("state", "state_timer", "teleport_cooldown", "wait_duration")
+    fields = {"state": PLAIN, "state_timer": PLAIN, "teleport_cooldown": PLAIN, "wait_duration": PLAIN}
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self):
+        self.state = "teleport" # teleport, waiting, shooting
+        self.state_timer = 0.0
+        self.teleport_cooldown = 2.0 # Seconds between teleports
+        self.wait_duration = 1.0     # Time spent standing still before shooting
+
+
 class Enemy(Serializable):
+    __slots__ = (
+        "rect", "bombs", "bullets", "color", "destroyed", "behaviour_type",
+        "max_hp", "hp", "dmg", "attk_spd", "crit_rate", "crit_dmg", "reward", "mov_spd", "max_spd",
+        "bomber", "attack_timer", "visible",
+        "_pos", "_vel", "_kin", "_row", "_prev", "_handle", "_pooled", "_bomber_state",
+    )
+    fields = {
+        "pos": VECTOR2, "rect": RECT, "vel": VECTOR2,
+        "bombs": ListOf("Bomb"), "bullets": ListOf("Bullet"),
+        "color": TUPLE, "destroyed": PLAIN, "behaviour_type": PLAIN,
+        "max_hp": PLAIN, "hp": PLAIN, "dmg": PLAIN, "attk_spd": PLAIN, "crit_rate": PLAIN, "crit_dmg": PLAIN,
+        "reward": PLAIN, "mov_spd": PLAIN, "max_spd": PLAIN,
+        "bomber": Nested("BomberState"), "attack_timer": PLAIN, "visible": PLAIN,
+    }
+
     def __init__(self, x, y, w, h, e_type):
+        self._kin = None
+        self._pos = pygame.Vector2()
+        self._vel = pygame.Vector2()
+        self.rect = pygame.Rect(0, 0, 0, 0)
+        self.bombs = []
+        self.bullets = []
+        # Every enemy owns one, a pooled enemy coming back as a bomber then allocates nothing mid-stage
+        self._bomber_state = BomberState()
+        self.reset(x, y, w, h, e_type)
+
+    def reset(self, x, y, w, h, e_type):
         # === Object ===
-        self.pos = pygame.Vector2(x, y)
-        self.rect = pygame.Rect(self.pos.x, self.pos.y, w, h)
+        # Pooled enemies are reset before they are spawned, so these are still their own vectors
+        self._pos.update(x, y)
+        self.rect.update(x, y, w, h)
+        self._prev = None  # Drawn where it spawns, not lerped from where its last pooled life ended
         self.color = RED
         self.destroyed = False
         self.behaviour_type = e_type
@@ -484,125 +698,140 @@ class Enemy(Serializable):
 
         # === Mov Stats ===
         self.mov_spd = 50
-        self.vel = pygame.Vector2(0, 0)
-        self.acc = pygame.Vector2(0, 0)
+        self._vel.update(0, 0)
         self.max_spd = self.mov_spd
 
         # === Bomb Behaviour ===
-        self.state = "teleport" # teleport, waiting, shooting
-        self.state_timer = 0.0
-        self.teleport_cooldown = 2.0 # Seconds between teleports
-        self.wait_duration = 1.0     # Time spent standing still before shooting
-        self.bombs = []
+        if e_type == "bomber":
+            self.bomber = self._bomber_state
+            self.bomber.reset()
+        else:
+            self.bomber = None
+        self.bombs.clear()
 
         # === Range/Melee Behaviour ===
         self.attack_timer = 0.0
-        self.bullets = []
+        self.bullets.clear()
         self.visible = False  # enemy starts hidden
 
-
-    def to_dict(self):
-        data = super().to_dict()
-        data["bullets"] = [b.to_dict() for b in self.bullets]
-        data["enemy_type"] = self.behaviour_type
-        return data
-    
     @classmethod
     def from_dict(cls, data):
-        rect_data = data["rect"]  # [x, y, w, h]
-        e_type = data["enemy_type"]
-        enemies = cls(*rect_data["value"], e_type)
-        enemies.bullets = [
-            Bullet.from_dict(b) for b in data["bullets"]
-        ]
-        return enemies
+        enemy = super().from_dict(data)
+        if "bomber" not in data:
+            # Older saves kept the bomber state flat on every enemy
+            enemy.bomber = BomberState.from_dict(data) if data.get("behaviour_type") == "bomber" else None
+        enemy._bomber_state = enemy.bomber or BomberState()
+        return enemy
+
+    # --- Movement state: its row of the spawner's EnemyKinematics while spawned, else its own ---
+    def bind(self, kinematics, row):
+        self._kin = kinematics
+        self._row = row
+
+    def unbind(self):
+        self._pos.update(self._kin.pos[self._row].tolist())
+        self._vel.update(self._kin.vel[self._row].tolist())
+        self._kin = None
+
+    @property
+    def pos(self):
+        # A view while spawned: pos[0] = x writes through
+        kin = getattr(self, "_kin", None)
+        return self._pos if kin is None else kin.pos[self._row]
+
+    @pos.setter
+    def pos(self, value):
+        kin = getattr(self, "_kin", None)
+        if kin is None:
+            self._pos = pygame.Vector2(value)  # Loading a save
+        else:
+            kin.pos[self._row] = value
+
+    @property
+    def vel(self):
+        kin = getattr(self, "_kin", None)
+        return self._vel if kin is None else kin.vel[self._row]
+
+    @vel.setter
+    def vel(self, value):
+        kin = getattr(self, "_kin", None)
+        if kin is None:
+            self._vel = pygame.Vector2(value)
+        else:
+            kin.vel[self._row] = value
 
-    def draw(self, camera):
+    def begin_tick(self):
+        self._prev = self.rect.topleft
+
+    def draw(self, alpha=1.0):
         if self.destroyed:
             return
-        
-        self.pos = pygame.Vector2(self.rect.x - camera.offset_x, self.rect.y - camera.offset_y)
-        self.rect.x, self.rect.y = self.pos
 
-        pygame.draw.rect(SCREEN, self.color, self.rect)
+        rect = lerp_rect(self.rect, getattr(self, "_prev", None), alpha)
+        drawn = pygame.draw.rect(SCREEN, self.color, rect)
 
         if self.hp < self.max_hp:
             # Health bar
             hp_ratio = max(0, self.hp / self.max_hp)
-            bar_width = self.rect.width
+            bar_width = rect.width
             bar_height = 6
-            bar_x = self.pos.x
-            bar_y = self.pos.y + self.rect.height + 10
+            bar_x = rect.x
+            bar_y = rect.y + rect.height + 10
 
-            pygame.draw.rect(SCREEN, (100, 100, 100), (bar_x, bar_y, bar_width, bar_height))
+            drawn = drawn.union(pygame.draw.rect(SCREEN, (100, 100, 100), (bar_x, bar_y, bar_width, bar_height)))
             pygame.draw.rect(SCREEN, (0, 255, 0), (bar_x, bar_y, bar_width * hp_ratio, bar_height))
+        return drawn
 
-    def update(self, player, dt, camera):
+    def act(self, player, target_pos, distance, dt, camera):
+        # Attacks and state changes for this tick. Movement is batched (see EnemyKinematics),
+        # the return value is how to steer: 1 towards the player, -1 away, 0 not at all
         self.attack_timer += dt
-        target_pos = pygame.Vector2(player.rect.center)
-        pos = pygame.Vector2(self.rect.center)
-        direction = target_pos - pos
-        distance = direction.length()
-
-        # Move in the direction of the package
-        if distance == 0: return
+        if distance == 0:
+            return 0
 
         # Attack pattern
         if self.behaviour_type == "melee":
-            self.behaviour_melee(player, dt, direction)
+            return self.behaviour_melee(player)
         elif self.behaviour_type == "range":
-            self.behaviour_range(target_pos, distance, direction)
+            return self.behaviour_range(target_pos, distance)
         elif self.behaviour_type == "bomber":
             self.behaviour_bomb(target_pos, dt, camera)
-
-        self.enemy_mov(dt)
-
-        self.rect.x, self.rect.y = self.pos.x, self.pos.y
+        return 0
 
 
     # --- Behaviour patterns ---
-    def behaviour_melee(self, target, dt, direction):
-        target_rect = target.rect
-        direction.normalize_ip()
-        self.acc = direction * self.max_spd
-
+    def behaviour_melee(self, target):
         # Check collision
-        if self.resolve_collision(target_rect):
-            # Stop moving
-            self.vel *= 0
-            self.acc *= 0
+        if not self.resolve_collision(target.rect):
+            return 1
 
-            # Attack
-            attack_interval = 1 / self.attk_spd
-            if self.attack_timer >= attack_interval:
-                target.take_dmg(self.dmg)
-                self.attack_timer = 0
-            else:
-                self.enemy_mov(dt)
+        # Stop moving
+        self.vel = 0, 0
 
+        # Attack
+        attack_interval = 1 / self.attk_spd
+        if self.attack_timer >= attack_interval:
+            target.take_dmg(self.dmg)
+            self.attack_timer = 0
+        return 0
 
-    def behaviour_range(self, target, distance, direction):
-        DESIRED_RADIUS = 250
-        TOLERANCE = 10
-
+    def behaviour_range(self, target, distance):
         if distance > DESIRED_RADIUS + TOLERANCE:
-            direction.normalize_ip()
-            self.acc = direction * self.max_spd
-
+            return 1
         elif distance < DESIRED_RADIUS - TOLERANCE:
-            direction.normalize_ip()
-            self.acc = -direction * self.max_spd
+            return -1
 
-        else:
-            # Shoot
-            attack_interval = 1 / self.attk_spd
-            if self.attack_timer >= attack_interval:
-                bullet = self.shoot(target)
-                self.bullets.append(bullet)  # handled by Game
-                self.attack_timer = 0
+        # Shoot
+        attack_interval = 1 / self.attk_spd
+        if self.attack_timer >= attack_interval:
+            bullet = self.shoot(target)
+            self.bullets.append(bullet)  # handled by Game
+            self.attack_timer = 0
+        return 0
 
     def behaviour_bomb(self, target_pos, dt, camera):
-        self.state_timer += dt
+        bomber = self.bomber
+        bomber.state_timer += dt
         
         # Define screen bounds in WORLD coordinates based on camera offset
         screen_left = camera.offset_x
@@ -610,7 +839,7 @@ class Enemy(Serializable):
         screen_top = camera.offset_y
         screen_bottom = camera.offset_y + 600 # Replace with your screen height
 
-        if self.state == "teleport":
+        if bomber.state == "teleport":
             # 1. Pick a random spot inside the screen
             # 2. Ensure it's within a certain radius of the player
             radius = 300
@@ -624,20 +853,20 @@ class Enemy(Serializable):
             final_x = max(screen_left, min(target_x, screen_right - self.rect.width))
             final_y = max(screen_top, min(target_y, screen_bottom - self.rect.height))
             
-            self.pos.update(final_x, final_y)
-            self.rect.topleft = (self.pos.x, self.pos.y)
-            self.vel.update(0, 0) # Stop all momentum
+            self.pos = final_x, final_y
+            self.rect.topleft = (final_x, final_y)
+            self.vel = 0, 0 # Stop all momentum
             
-            self.state = "waiting"
-            self.state_timer = 0
+            bomber.state = "waiting"
+            bomber.state_timer = 0
 
-        elif self.state == "waiting":
+        elif bomber.state == "waiting":
             # Just stand there for a second
-            if self.state_timer >= self.wait_duration:
-                self.state = "shooting"
-                self.state_timer = 0
+            if bomber.state_timer >= bomber.wait_duration:
+                bomber.state = "shooting"
+                bomber.state_timer = 0
 
-        elif self.state == "shooting":
+        elif bomber.state == "shooting":
             # --- THE LIMIT CHECK ---
             if len(self.bombs) < 1: 
                 # Only spawn if no bombs exist for THIS enemy
@@ -645,44 +874,29 @@ class Enemy(Serializable):
                 random_direction = pygame.Vector2(1, 0).rotate(random.randint(0, 360))
                 spawn_pos = self.rect.center + (random_direction * distance)
 
-                new_bomb = Bomb(spawn_pos.x, spawn_pos.y, self.dmg)
+                new_bomb = BOMB_POOL.acquire(spawn_pos.x, spawn_pos.y, self.dmg)
                 self.bombs.append(new_bomb)
                 
                 # Move to cooldown after successful spawn
-                self.state = "cooldown"
-                self.state_timer = 0
+                bomber.state = "cooldown"
+                bomber.state_timer = 0
             else:
                 # Optional: If you want the enemy to wait until the bomb explodes 
                 # before even starting the cooldown, do nothing here.
                 # Or, if you want them to teleport anyway:
-                self.state = "cooldown"
-                self.state_timer = 0
+                bomber.state = "cooldown"
+                bomber.state_timer = 0
             
-            self.state = "cooldown"
-            self.state_timer = 0
+            bomber.state = "cooldown"
+            bomber.state_timer = 0
 
-        elif self.state == "cooldown":
+        elif bomber.state == "cooldown":
             # Wait before teleporting again
-            if self.state_timer >= self.teleport_cooldown:
-                self.state = "teleport"
-                self.state_timer = 0
+            if bomber.state_timer >= bomber.teleport_cooldown:
+                bomber.state = "teleport"
+                bomber.state_timer = 0
 
 
-    def enemy_mov(self, dt):
-        self.vel += self.acc * dt
-
-        # Clamp speed
-        if self.vel.length() > self.max_spd:
-            self.vel.scale_to_length(self.max_spd)
-
-        # Move enemy
-        self.pos.x += self.vel.x * dt 
-        self.pos.y += self.vel.y * dt 
-
-
-        # Reset acceleration every frame
-        self.acc.update(0, 0)
-
     def resolve_collision(self, other_rect):
         if not self.rect.colliderect(other_rect):
             return False
@@ -700,24 +914,19 @@ class Enemy(Serializable):
                 self.rect.x += overlap_x
             else:
                 self.rect.x -= overlap_x
-            self.vel.x = 0
+            self.vel[0] = 0
         else:
             # Push vertically
             if dy > 0:
                 self.rect.y += overlap_y
             else:
                 self.rect.y -= overlap_y
-            self.vel.y = 0
+            self.vel[1] = 0
 
         return True
 
     def shoot(self, target_pos):
-        bullet = Bullet(
-            x=self.rect.centerx,
-            y=self.rect.centery,
-            target=target_pos,
-            dmg=self.dmg
-        )
+        bullet = BULLET_POOL.acquire(self.rect.centerx, self.rect.centery, target_pos, self.dmg)
         return bullet
 
     def take_damage(self, dmg):
@@ -737,6 +946,16 @@ class Enemy(Serializable):
 
 
 class Boss(Serializable):
+    fields = {
+        "pos": VECTOR2, "rect": RECT, "vel": VECTOR2, "acc": VECTOR2,
+        "bombs": ListOf("Bomb"), "bullets": ListOf("Bullet"),
+        "color": TUPLE, "destroyed": PLAIN, "behaviour_type": PLAIN,
+        "max_hp": PLAIN, "hp": PLAIN, "dmg": PLAIN, "attk_spd": PLAIN, "crit_rate": PLAIN, "crit_dmg": PLAIN,
+        "reward": PLAIN, "mov_spd": PLAIN, "max_spd": PLAIN,
+        "state": PLAIN, "state_timer": PLAIN, "teleport_cooldown": PLAIN, "wait_duration": PLAIN,
+        "attack_timer": PLAIN, "visible": PLAIN,
+    }
+
     def __init__(self, x, y, w, h, b_type):
         # === Object ===
         self.pos = pygame.Vector2(x, y)
@@ -773,22 +992,6 @@ class Boss(Serializable):
         self.visible = False  # enemy starts hidden
 
 
-    def to_dict(self):
-        data = super().to_dict()
-        data["bullets"] = [b.to_dict() for b in self.bullets]
-        data["boss_type"] = self.behaviour_type
-        return data
-    
-    @classmethod
-    def from_dict(cls, data):
-        rect_data = data["rect"]  # [x, y, w, h]
-        e_type = data["boss_type"]
-        enemies = cls(*rect_data["value"], e_type)
-        enemies.bullets = [
-            Bullet.from_dict(b) for b in data["bullets"]
-        ]
-        return enemies
-
     def draw(self, camera):
         if self.destroyed:
             return
@@ -1009,17 +1212,70 @@ class Boss(Serializable):
 
 
 class EnemySpawner(Serializable):
+    # Bombs are saved with the enemy that planted them, bullets as their own section (see save_game_data)
+    fields = {
+        "rectmap": RECT, "spawn_timer": PLAIN, "spawn_interval": PLAIN, "max_enemies": PLAIN,
+        "spawned_enemies": ListOf("Enemy"),
+    }
+
     def __init__(self, rectmap):
         self.rectmap = rectmap
         self.spawn_timer = 0.0
         self.spawn_interval = 1.0
         self.max_enemies = 10
-        self.spawned_enemies = []
-
-    def to_dict(self):
-        data = super().to_dict()
-        data["spawned_enemies"] = [e.to_dict() for e in self.spawned_enemies]
-        return data
+        self.spawned_enemies = EntityRegistry()
+        self.bombs = EntityRegistry()          # Bombs of every enemy
+        self.projectiles = ProjectileStore()  # Bullets of every enemy
+        self.kinematics = EnemyKinematics(self.spawned_enemies)  # Position and velocity of every enemy
+
+    def collect_spawns(self):
+        # Enemies queue new bullets and bombs on themselves, the spawner owns them from here
+        for enemy in self.spawned_enemies:
+            if enemy.bullets:
+                for bullet in enemy.bullets:
+                    self.projectiles.add_bullet(bullet)
+                    BULLET_POOL.release(bullet)
+                enemy.bullets.clear()
+
+            for bomb in enemy.bombs:
+                if getattr(bomb, "_handle", None) is None:
+                    bomb._owner = enemy
+                    self.bombs.create(bomb)
+
+    def add_enemy(self, enemy):
+        self.spawned_enemies.create(enemy)
+        self.kinematics.add(enemy)
+
+    def despawn(self, enemy):
+        # Queued, the entity is released on the next flush()
+        self.spawned_enemies.destroy(enemy)
+        for bomb in enemy.bombs:
+            self.bombs.destroy(bomb)
+
+    def flush(self):
+        # Compact the registries once per frame, returns the enemies that were removed
+        for bomb in self.bombs.flush():
+            owner = getattr(bomb, "_owner", None)
+            if owner is not None and bomb in owner.bombs:
+                owner.bombs.remove(bomb)
+            BOMB_POOL.release(bomb)
+
+        removed = self.spawned_enemies.flush()
+        for enemy in removed:
+            self.kinematics.remove(enemy)
+            for bullet in enemy.bullets:
+                BULLET_POOL.release(bullet)
+            enemy.bullets.clear()
+            ENEMY_POOL.release(enemy)
+        return removed
+
+    def prewarm(self, multiplier):
+        # Stage start: have enough objects for the stage's enemy cap ready
+        current_max = int(10 * multiplier)
+        # Any kind: each enemy carries its bomber state, so reset() turns it into any other kind in place
+        ENEMY_POOL.prewarm(current_max - len(self.spawned_enemies), 0, 0, 50, 50, "melee")
+        BOMB_POOL.prewarm(current_max, 0, 0, 0)
+        BULLET_POOL.prewarm(current_max, 0, 0, (1, 0), 0)
 
     def update(self, dt, multiplier, is_active):
         # 1. Only progress spawn timer if the stage is ACTIVE
@@ -1045,37 +1301,57 @@ class EnemySpawner(Serializable):
         # Randomly choose between types
         enemy_type = random.choice(["melee", "range", "bomber"])
 
-        enemy = Enemy(x, y, 50, 50, enemy_type)
+        enemy = ENEMY_POOL.acquire(x, y, 50, 50, enemy_type)
         enemy.apply_difficulty(multiplier)
 
-        self.spawned_enemies.append(enemy)
+        self.add_enemy(enemy)
 
     @classmethod
     def from_dict(cls, data, rectmap):
         spawner = cls(rectmap)
-
-        spawner.spawned_enemies = [
-            Enemy.from_dict(e) for e in data["spawned_enemies"]
-        ]
+        spawner.spawn_timer = data.get("spawn_timer", spawner.spawn_timer)
+        spawner.spawn_interval = data.get("spawn_interval", spawner.spawn_interval)
+        spawner.max_enemies = data.get("max_enemies", spawner.max_enemies)
+
+        for e in data["spawned_enemies"]:
+            spawner.add_enemy(Enemy.from_dict(e))
+        # Older saves keep bullets on each enemy instead
+        spawner.projectiles.load(data.get("bullets", []))
+        spawner.collect_spawns()
         return spawner
 
 
 class Item(Serializable):
+    __slots__ = ("pos", "rect", "color", "heal_percent", "destroyed", "_prev", "_handle", "_pooled")
+    fields = {"pos": VECTOR2, "rect": RECT, "color": TUPLE, "heal_percent": PLAIN, "destroyed": PLAIN}
+
     def __init__(self, x, y):
-        self.pos = pygame.Vector2(x, y)
-        self.rect = pygame.Rect(self.pos.x, self.pos.y, 50, 50)
+        self.pos = pygame.Vector2()
+        self.rect = pygame.Rect(0, 0, 0, 0)
+        self.reset(x, y)
+
+    def reset(self, x, y):
+        self.pos.update(x, y)
+        self.rect.update(self.pos.x, self.pos.y, 50, 50)
+        self._prev = None  # Drawn where it spawns, not lerped from where its last pooled life ended
         self.color = GREEN
         self.heal_percent = 0.05  # 5%
 
         self.destroyed = False
 
-    def draw(self, camera):
+    def begin_tick(self):
+        self._prev = self.rect.topleft
+
+    def scroll(self, camera):
+        self.pos.update(self.rect.x - camera.offset_x, self.rect.y - camera.offset_y)
+        self.rect.x, self.rect.y = self.pos
+
+    def draw(self, alpha=1.0):
         if self.destroyed:
             return
-        
-        self.pos = pygame.Vector2(self.rect.x - camera.offset_x, self.rect.y - camera.offset_y)
-        self.rect.x, self.rect.y = self.pos
-        pygame.draw.rect(SCREEN, self.color, self.rect)
+
+        rect = lerp_rect(self.rect, getattr(self, "_prev", None), alpha)
+        return pygame.draw.rect(SCREEN, self.color, rect)
 
     def on_click(self, package):
         if self.destroyed:
@@ -1089,16 +1365,13 @@ class Item(Serializable):
 
 
 class ItemSpawner(Serializable):
+    fields = {"spawn_timer": PLAIN, "spawn_interval": PLAIN, "max_item": PLAIN, "spawned_items": ListOf("Item")}
+
     def __init__(self):
         self.spawn_timer = 0.0
         self.spawn_interval = 2.0
         self.max_item = 5
-        self.spawned_items = []
-
-    def to_dict(self):
-        data = super().to_dict()
-        data["spawned_items"] = [i.to_dict() for i in self.spawned_items]
-        return data
+        self.spawned_items = EntityRegistry()
 
     def update(self, dt):
         self.spawn_timer += dt
@@ -1114,17 +1387,40 @@ class ItemSpawner(Serializable):
     def spawn_item(self):
         x = random.randint(10, SC_W - 10)
         y = random.randint(10, SC_H - 10)
-        item = Item(x, y)
-        self.spawned_items.append(item)
+        item = ITEM_POOL.acquire(x, y)
+        self.spawned_items.create(item)
+
+    def despawn(self, item):
+        # Queued, the item is released on the next flush()
+        self.spawned_items.destroy(item)
+
+    def flush(self):
+        removed = self.spawned_items.flush()
+        for item in removed:
+            ITEM_POOL.release(item)
+        return removed
+
+    def prewarm(self):
+        ITEM_POOL.prewarm(self.max_item - len(self.spawned_items), 0, 0)
 
     @classmethod
     def from_dict(cls, data):
         item_spawner = cls()
-        item_spawner.spawned_items = [
+        item_spawner.spawn_timer = data.get("spawn_timer", item_spawner.spawn_timer)
+        item_spawner.spawn_interval = data.get("spawn_interval", item_spawner.spawn_interval)
+        item_spawner.max_item = data.get("max_item", item_spawner.max_item)
+        item_spawner.spawned_items.extend(
             Item.from_dict(i) for i in data["spawned_items"]
-        ]
+        )
         return item_spawner
         
+# === POOLS ===
+ENEMY_POOL = ObjectPool(Enemy)
+BOMB_POOL = ObjectPool(Bomb)
+ITEM_POOL = ObjectPool(Item)
+BULLET_POOL = ObjectPool(Bullet)
+
+
 class Upgrade():
     def __init__(self):
         # === Object ===
@@ -1213,7 +1509,7 @@ class Upgrade():
             pygame.draw.rect(SCREEN, WHITE, image_rect, border_radius=8)
             pygame.draw.rect(SCREEN, WHITE, image_rect, 2, border_radius=8)
 
-            font = pygame.font.Font(FONT_PATH, 20)
+            font = get_font(FONT_PATH, 20)
 
             # Get current value from package first, then player
             stat = upgrade['stat']
@@ -1223,8 +1519,8 @@ class Upgrade():
                 current = 0
 
             # --- TEXT ---
-            label_surf = font.render(f"{upgrade['label']}: {current} (+{upgrade['mod']})", True, BLACK)
-            cost_surf = font.render(f"Cost: ${upgrade['cost']}", True, BLACK)
+            label_surf = TEXT_CACHE.render(f"{upgrade['label']}: {current} (+{upgrade['mod']})", font, BLACK)
+            cost_surf = TEXT_CACHE.render(f"Cost: ${upgrade['cost']}", font, BLACK)
 
             SCREEN.blit(label_surf, (card['rect'].x + PADDING, image_rect.bottom + PADDING))
             SCREEN.blit(cost_surf, (card['rect'].x + PADDING, image_rect.bottom + PADDING + 25))
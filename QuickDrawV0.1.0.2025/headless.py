@@ -0,0 +1,118 @@
+import os
+import time
+import random
+import argparse
+
+# Must be set before config is imported: no window, offscreen SCREEN
+os.environ["QUICKDRAW_HEADLESS"] = "1"
+
+import pygame
+from config import *
+from main import Game
+
+
+class KeyState:
+    """ Stands in for pygame.key.get_pressed() """
+    def __init__(self, pressed=()):
+        self.pressed = set(pressed)
+
+    def __getitem__(self, key):
+        return key in self.pressed
+
+
+class ScriptedInput:
+    """ Programmable input source: clicks, key presses and held keys per simulation tick.
+    policy(tick, game) can also return events, for input that reacts to the game state. """
+    def __init__(self, policy=None):
+        self.policy = policy
+        self.scheduled = {}  # tick -> [event]
+        self.holds = []      # (key, start, end)
+
+    def click(self, tick, pos, button=1):
+        event = pygame.event.Event(pygame.MOUSEBUTTONDOWN, button=button, pos=tuple(pos))
+        self.scheduled.setdefault(tick, []).append(event)
+
+    def key(self, tick, key):
+        event = pygame.event.Event(pygame.KEYDOWN, key=key, mod=0, unicode="", scancode=0)
+        self.scheduled.setdefault(tick, []).append(event)
+
+    def hold(self, key, start, end):
+        self.holds.append((key, start, end))
+
+    def events_for(self, tick, game):
+        events = list(self.scheduled.get(tick, ()))
+        if self.policy:
+            events.extend(self.policy(tick, game) or ())
+        return events
+
+    def keys_for(self, tick):
+        return KeyState(key for key, start, end in self.holds if start <= tick < end)
+
+
+def auto_aim(every=6):
+    # Policy: shoot the enemy closest to the player every few ticks
+    def policy(tick, game):
+        if tick % every:
+            return ()
+        enemies = [e for e in game.spawner.spawned_enemies if not e.destroyed]
+        if not enemies:
+            return ()
+        center = pygame.Vector2(game.player.rect.center)
+        target = min(enemies, key=lambda e: center.distance_squared_to(e.rect.center))
+        return [pygame.event.Event(pygame.MOUSEBUTTONDOWN, button=1, pos=target.rect.center)]
+    return policy
+
+
+def run_headless(ticks, inputs=None, sim_hz=SIM_HZ, seed=None, game=None, stop_on_death=True):
+    """ Step a Game as fast as the CPU allows, no drawing. Returns a report dict. """
+    if seed is not None:
+        random.seed(seed)
+    inputs = inputs or ScriptedInput()
+    tick_dt = 1 / sim_hz
+
+    # Player cooldowns and reloads follow simulated time, not the wall clock
+    sim_ms = [0]
+    set_sim_clock(lambda: sim_ms[0])
+    try:
+        game = game or Game()
+        start = time.perf_counter()
+        tick = 0
+        while tick < ticks:
+            sim_ms[0] = int(tick * tick_dt * 1000)
+            events = inputs.events_for(tick, game)
+            if game.handle_events(events, None):
+                break
+            game.step(tick_dt, inputs.keys_for(tick))
+            tick += 1
+            if stop_on_death and game.player.hp <= 0:
+                break
+        wall = time.perf_counter() - start
+    finally:
+        set_sim_clock(None)
+
+    sim_seconds = tick * tick_dt
+    return {
+        "ticks": tick,
+        "sim_seconds": round(sim_seconds, 3),
+        "wall_seconds": round(wall, 3),
+        "speedup": round(sim_seconds / wall, 1) if wall else None,  # Simulated s per wall s
+        "stage": game.difficulty.stage,
+        "player_hp": game.player.hp,
+        "enemies": len(game.spawner.spawned_enemies),
+        "bullets": len(game.spawner.projectiles),
+        "wallet": game.player.wallet,
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Run Quick Draw headless, as fast as possible")
+    parser.add_argument("--seconds", type=float, default=300, help="simulated seconds")
+    parser.add_argument("--hz", type=int, default=SIM_HZ, help="simulation tick rate")
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--auto-aim", action="store_true", help="shoot the nearest enemy")
+    args = parser.parse_args()
+
+    inputs = ScriptedInput(policy=auto_aim() if args.auto_aim else None)
+    report = run_headless(int(args.seconds * args.hz), inputs, sim_hz=args.hz, seed=args.seed)
+    for key, value in report.items():
+        print(f"{key}: {value}")
@@ -0,0 +1,250 @@
+import struct
+from collections import deque
+
+import numpy
+import pygame
+from config import *
+from physics import BULLET_COLOR
+
+
+# === KILL CAM ===
+# The last seconds before death as one compact binary record per simulation tick, in a fixed-size ring.
+# Every enemy, bomb and bullet is in every record. Positions are int16 screen coordinates, all x then all y,
+# stored as int8 steps from the previous record while the group holds the same entities in the same order
+# and every step fits, absolute otherwise. Enemy positions come straight from the spawner's EnemyKinematics
+# arrays, bullets from ProjectileStore's. Every KILLCAM_KEYFRAME ticks everything is stored absolute, and
+# records are evicted a keyframe group at a time, so the oldest one always decodes.
+KILLCAM_SECONDS = 0 if HEADLESS else 5.0  # Recorded window, 0 = off
+KILLCAM_BYTES = 4 * 1024 * 1024           # Hard cap on recorded data, the window shrinks to fit
+KILLCAM_KEYFRAME = 30                     # Ticks between records holding only absolute arrays
+
+# tick, map x/y, player x/y/w/h, player hp/max hp, enemies/bombs/bullets, flags
+_HEADER = struct.Struct("<IiihhHHffHHHB")
+_ENEMIES_DELTA, _BOMBS_DELTA, _BULLETS_DELTA = 1, 2, 4
+
+
+class KillCam:
+    """ Ring buffer of the last `seconds` of simulation, for replaying a death """
+    def __init__(self, seconds=KILLCAM_SECONDS, capacity=KILLCAM_BYTES, keyframe_every=KILLCAM_KEYFRAME):
+        self.seconds = seconds
+        self.window = int(seconds * SIM_HZ)
+        self.keyframe_every = keyframe_every
+        self.buffer = bytearray(capacity if seconds else 0)
+        self.records = deque()    # (tick, offset, size, keyframe)
+        self.keyframes = deque()  # Ticks of the keyframes in records
+        self.head = 0
+        self.tick = 0
+
+        self._bases = {}      # group -> (layout, int16 positions) of the last record, the base for steps
+        self._decoded = None  # (index, state) of the last decode, replay reads forward
+
+    def __len__(self):
+        return len(self.records)
+
+    def clear(self):
+        self.records.clear()
+        self.keyframes.clear()
+        self.head = 0
+        self._bases = {}
+        self._decoded = None
+
+    # --- Recording ---
+    def record(self, game):
+        if not self.seconds:
+            return
+        tick = self.tick
+        self.tick += 1
+        keyframe = not self.keyframes or tick - self.keyframes[-1] >= self.keyframe_every
+        flags = 0
+        parts = []
+
+        # Per-entity attribute reads are the cost: only what has no array yet is read, once, in a list
+        # comprehension packed with struct. Screen coordinates of a WORLD_SIZE map never get near int16 limits.
+        # Enemies: positions, hp as a float16 ratio of max hp, sizes when absolute
+        registry = game.spawner.spawned_enemies
+        enemies = registry.dense
+        n_enemies = len(enemies)
+        pos = game.spawner.kinematics.positions().T.astype(numpy.int16)
+        if self._positions("enemies", (registry.created, registry.destroyed), pos, keyframe, parts):
+            flags |= _ENEMIES_DELTA
+        parts.append(struct.pack(f"<{n_enemies}e", *[e.hp / e.max_hp for e in enemies]))
+        if not flags & _ENEMIES_DELTA:
+            parts.append(struct.pack(f"{n_enemies * 2}B", *[v for e in enemies for v in e.rect.size]))
+
+        # Bombs: positions, fuse in seconds (float32, benchmarks pin it far out), blast radius when absolute
+        registry = game.spawner.bombs
+        bombs = registry.dense
+        n_bombs = len(bombs)
+        rects = [b.rect for b in bombs]
+        coords = [r.x for r in rects]
+        coords += [r.y for r in rects]
+        pos = numpy.array(coords, dtype=numpy.int16).reshape(2, n_bombs)
+        if self._positions("bombs", (registry.created, registry.destroyed), pos, keyframe, parts):
+            flags |= _BOMBS_DELTA
+        parts.append(struct.pack(f"<{n_bombs}f", *[b.timer for b in bombs]))
+        if not flags & _BOMBS_DELTA:
+            parts.append(struct.pack(f"<{n_bombs}H", *[b.blast_radius for b in bombs]))
+
+        # Bullets: centers, truncated like ProjectileStore.draw() does, radius when absolute
+        projectiles = game.spawner.projectiles
+        n = projectiles.count
+        pos = projectiles.pos[:n].T.astype(numpy.int16)
+        if self._positions("bullets", (projectiles.layout, n), pos, keyframe, parts):
+            flags |= _BULLETS_DELTA
+        else:
+            parts.append(projectiles.radius[:n].astype(numpy.uint8).tobytes())
+
+        player = game.player
+        header = _HEADER.pack(
+            tick, game.rectmap.rect.x, game.rectmap.rect.y,
+            *player.rect, player.hp, player.max_hp,
+            n_enemies, n_bombs, n, flags,
+        )
+        self._store(header + b"".join(parts), tick, keyframe)
+
+    def _positions(self, name, layout, pos, keyframe, parts):
+        # int8 steps from the last record when it held the same entities in the same order, True if so
+        base = self._bases.get(name)
+        self._bases[name] = (layout, pos)
+        if not keyframe and base is not None and base[0] == layout:
+            step = pos - base[1]  # Both int16, never near overflow
+            if not step.size or numpy.abs(step).max() <= 127:
+                parts.append(step.astype(numpy.int8).tobytes())
+                return True
+        parts.append(pos.tobytes())
+        return False
+
+    def _fit(self, size):
+        # Offset where size bytes fit without touching a live record, or None
+        if not self.records:
+            return 0
+        start = self.records[0][1]
+        if self.head > start:
+            if self.head + size <= len(self.buffer):
+                return self.head
+            return 0 if size <= start else None
+        return self.head if self.head + size <= start else None
+
+    def _evict_group(self):
+        self.records.popleft()
+        self.keyframes.popleft()
+        while self.records and not self.records[0][3]:
+            self.records.popleft()
+
+    def _store(self, blob, tick, keyframe):
+        size = len(blob)
+        if size > len(self.buffer):
+            # Not even one tick fits: record nothing rather than break the cap
+            self.clear()
+            return
+        offset = self._fit(size)
+        while offset is None:
+            self._evict_group()
+            if not keyframe and not self.records:
+                # This delta's own keyframe had to go, start over with a keyframe next tick
+                self.clear()
+                return
+            offset = self._fit(size)
+        self.buffer[offset:offset + size] = blob
+        self.head = offset + size
+        self.records.append((tick, offset, size, keyframe))
+        if keyframe:
+            self.keyframes.append(tick)
+        self._decoded = None
+
+        # Keep whole groups while the rest still covers the window
+        while len(self.keyframes) > 1 and self.keyframes[1] <= tick - self.window:
+            self._evict_group()
+
+    # --- Replay ---
+    def _decode(self, index, base):
+        _, offset, size, _ = self.records[index]
+        blob = memoryview(self.buffer)[offset:offset + size]
+        (tick, map_x, map_y, px, py, pw, ph, hp, max_hp,
+         n_enemies, n_bombs, n_bullets, flags) = _HEADER.unpack_from(blob)
+        at = _HEADER.size
+
+        def read(dtype, count, shape=None):
+            nonlocal at
+            # Copied, the ring slot is reused once it is evicted
+            array = numpy.frombuffer(blob, dtype=dtype, count=count, offset=at).copy()
+            at += array.nbytes
+            return array.reshape(shape) if shape else array
+
+        def positions(n, delta, name):
+            if delta:
+                return base[name] + read(numpy.int8, n * 2, (2, n))
+            return read("<i2", n * 2, (2, n))
+
+        state = {"tick": tick, "map": (map_x, map_y), "player": (px, py, pw, ph, hp, max_hp)}
+        delta = flags & _ENEMIES_DELTA
+        state["enemies"] = positions(n_enemies, delta, "enemies")
+        state["enemy_hp"] = read("<f2", n_enemies)
+        state["enemy_size"] = base["enemy_size"] if delta else read(numpy.uint8, n_enemies * 2, (n_enemies, 2))
+
+        delta = flags & _BOMBS_DELTA
+        state["bombs"] = positions(n_bombs, delta, "bombs")
+        state["bomb_timer"] = read("<f4", n_bombs)
+        state["bomb_radius"] = base["bomb_radius"] if delta else read("<u2", n_bombs)
+
+        delta = flags & _BULLETS_DELTA
+        state["bullets"] = positions(n_bullets, delta, "bullets")
+        state["bullet_radius"] = base["bullet_radius"] if delta else read(numpy.uint8, n_bullets)
+        return state
+
+    def state(self, index):
+        """ Decoded record, 0 is the oldest kept. Decodes forward from its keyframe """
+        if self._decoded and self._decoded[0] == index:
+            return self._decoded[1]
+        if self._decoded and self._decoded[0] == index - 1:
+            start, state = index, self._decoded[1]
+        else:
+            start = index
+            while not self.records[start][3]:
+                start -= 1
+            state = None
+        for i in range(start, index + 1):
+            state = self._decode(i, state)
+        self._decoded = (index, state)
+        return state
+
+    def draw(self, index, player, surface=None):
+        # Plain shapes in the game's colors and draw order, no HUD
+        surface = SCREEN if surface is None else surface
+        state = self.state(index)
+        surface.fill(DESERT)
+        map_rect = pygame.Rect(state["map"], (WORLD_SIZE, WORLD_SIZE))
+        pygame.draw.rect(surface, BLACK, map_rect.inflate(6, 6))
+        pygame.draw.rect(surface, WHITE, map_rect)
+
+        px, py, pw, ph, hp, max_hp = state["player"]
+        rect = pygame.Rect(px, py, pw, ph)
+        pygame.draw.rect(surface, player.border_color, rect.inflate(player.border_size * 2, player.border_size * 2), border_radius=8)
+        pygame.draw.rect(surface, player.color, rect, border_radius=8)
+        label = TEXT_CACHE.render(f"{max(0, int(hp))}/{int(max_hp)}", get_font(FONT_PATH, 20), BLACK)
+        surface.blit(label, label.get_rect(center=(rect.centerx, rect.bottom + 20)))
+
+        for (x, y), (w, h), hp in zip(state["enemies"].T.tolist(), state["enemy_size"].tolist(), state["enemy_hp"].tolist()):
+            pygame.draw.rect(surface, RED, (x, y, w, h))
+            if hp < 1:
+                pygame.draw.rect(surface, (100, 100, 100), (x, y + h + 10, w, 6))
+                pygame.draw.rect(surface, (0, 255, 0), (x, y + h + 10, w * max(0, hp), 6))
+
+        for (x, y), fuse, radius in zip(state["bombs"].T.tolist(), state["bomb_timer"].tolist(), state["bomb_radius"].tolist()):
+            rect = pygame.Rect(x, y, 20, 60)
+            pygame.draw.circle(surface, (200, 0, 0), rect.center, radius, 2)
+            pygame.draw.rect(surface, (50, 50, 50), rect)
+            if int(fuse * 5) % 2 == 0:
+                pygame.draw.circle(surface, (255, 0, 0), rect.center, 5)
+
+        for (x, y), r in zip(state["bullets"].T.tolist(), state["bullet_radius"].tolist()):
+            pygame.draw.circle(surface, BULLET_COLOR, (x, y), r)
+
+    def stats(self):
+        used = sum(size for _, _, size, _ in self.records)
+        return {
+            "records": len(self.records),
+            "seconds": round(len(self.records) / SIM_HZ, 2),
+            "bytes": used,
+            "capacity": len(self.buffer),
+        }
@@ -1,10 +1,12 @@
+from config import *  # First: the startup report times pygame's import from here
 import pygame
-from config import *
 import json
 from entity import *
-
-# Initialize pygame
-pygame.init()
+from physics import SpatialHash
+from profiler import PhaseTimer, FrameProfiler, PROFILE_KEY
+from autosave import Autosaver, JOURNAL_WRITER, latest_save
+from killcam import KillCam
+from audio import SFX
 
 
 class Game():
@@ -17,6 +19,8 @@ class Game():
             self.player = Player.from_dict(load_data["player"])
             self.spawner = EnemySpawner.from_dict(load_data["spawners"], self.rectmap.rect)
             self.items_spawn = ItemSpawner.from_dict(load_data["items"])
+            if "projectiles" in load_data:
+                self.spawner.projectiles.load_bytes(load_data["projectiles"])
             # assign enemies etc.
         else:
             self.player = Player(x = self.rectmap.rect.centerx - 75, y = self.rectmap.rect.centery - 37.5, width=125, height=75, color=RED, border_color=BLACK, border_size=2)
@@ -27,6 +31,28 @@ class Game():
         self.upgrade = Upgrade()
         self.difficulty = DifficultyManager()
         self.camera = Camera(SC_W, SC_H)
+        self.culler = ViewCuller(self.camera)
+        self.renderer = DirtyRenderer()
+
+        # Stage the object pools were last pre-warmed for
+        self.pool_stage = None
+
+        # Fixed-timestep simulation, rendering interpolates between ticks
+        self.sim_hz = SIM_HZ
+        self.max_sim_steps = MAX_SIM_STEPS
+        self.render_fps = display_refresh_rate()
+        self.pending_hits = []
+        self.phases = PhaseTimer()
+        self.profiler = FrameProfiler(self.phases)
+        self.profiler.budget_ms = 1000 / self.render_fps
+
+        self.autosave = Autosaver()
+        self.killcam = KillCam()
+        SFX.preload()  # Decode every sound now, not on the first shot
+
+        # Broadphase for enemy-enemy and enemy-item collision
+        self.grid = SpatialHash(cell_size=128)
+        self.collision_stats = self.grid.stats()
 
     def game_over_screen(self, snapshot):
         bttn_items = ['try again', 'main menu']
@@ -79,104 +105,289 @@ class Game():
                 bttn.draw(hover=hover)
 
             # Draw title
-            font = pygame.font.Font(None, 74)
-            text = font.render("GAME OVER", True, (0, 0, 0))
+            font = get_font(None, 74)
+            text = TEXT_CACHE.render("GAME OVER", font, (0, 0, 0))
             text_rect = text.get_rect(center=(go_screen.posx + go_screen.rect.width // 2, go_screen.posy+ 50))
             SCREEN.blit(text, text_rect)
 
             pygame.display.update()
 
-    def run(self):
+    def kill_cam_screen(self):
+        """ Replays the last seconds before death. Left/right or the bar scrub, space pauses, enter skips """
+        killcam = self.killcam
+        if not len(killcam):
+            return
         clock = pygame.time.Clock()
-        running = True
-
-        while running:
-            snapshot = SCREEN.copy()
-            SCREEN.fill(DESERT)
-            self.rectmap.draw(self.camera)
-            self.rectmap.draw_border_overlay()
-            dt = clock.tick(60) / 1000  # ← THIS LINE
-            events = pygame.event.get()
-            enemies = []
-            self.difficulty.draw()
-            self.difficulty.update(dt, self.spawner.spawned_enemies)
-            self.camera.camera_control(self.player, self.rectmap)
-            
-            # Handle input/events
-            for event in events:
-                if event.type == pygame.QUIT:
-                    save_game_data(self.player, self.spawner, self.items_spawn)
-                    return "menu"
+        last = len(killcam) - 1
+        frame = 0
+        playing = True
+        bar = pygame.Rect(SC_W // 2 - 300, SC_H - 60, 600, 12)
+        font = get_font(None, 28)
+        hint = TEXT_CACHE.render("KILL CAM   LEFT/RIGHT scrub   SPACE pause   ENTER continue", font, BLACK)
+
+        while True:
+            for event in pygame.event.get():
                 if event.type == pygame.KEYDOWN:
-                    if event.key == pygame.K_b:
-                        self.upgrade.show_menu = not self.upgrade.show_menu
-                    elif event.key == pygame.K_ESCAPE:
-                        player_data, spawner_data, items_data = save_game_data(self.player, self.spawner, self.items_spawn)
-                        return {"state":"pause", "snapshot":snapshot, "saved_data": (player_data, spawner_data, items_data)}
-                if event.type == pygame.MOUSEWHEEL:
-                    self.upgrade.scroll_offset -= event.y * self.upgrade.scroll_speed
-            
+                    if event.key in (pygame.K_RETURN, pygame.K_ESCAPE):
+                        return
+                    elif event.key == pygame.K_SPACE:
+                        playing = not playing
+                        if playing and frame == last:
+                            frame = 0
+                    elif event.key in (pygame.K_LEFT, pygame.K_RIGHT):
+                        step = SIM_HZ // 4 if event.key == pygame.K_RIGHT else -SIM_HZ // 4
+                        frame = min(last, max(0, frame + step))
+                        playing = False
+                elif event.type == pygame.MOUSEBUTTONDOWN and event.button == 1 and bar.inflate(0, 20).collidepoint(event.pos):
+                    frame = round((event.pos[0] - bar.x) / bar.width * last)
+                    frame = min(last, max(0, frame))
+                    playing = False
+
+            killcam.draw(frame, self.player)
+            pygame.draw.rect(SCREEN, WHITE, bar)
+            pygame.draw.rect(SCREEN, RED, (bar.x, bar.y, bar.width * frame / max(last, 1), bar.height))
+            pygame.draw.rect(SCREEN, BLACK, bar, 2)
+            SCREEN.blit(hint, hint.get_rect(midbottom=(bar.centerx, bar.top - 10)))
+            pygame.display.flip()
+
+            # One recorded tick per frame: real speed
+            clock.tick(SIM_HZ)
+            if playing:
+                if frame == last:
+                    playing = False
+                else:
+                    frame += 1
+
+    def handle_events(self, events, snapshot):
+        # Handle input/events
+        for event in events:
+            if event.type == pygame.QUIT:
+                save_game_data(self.player, self.spawner, self.items_spawn)
+                return "menu"
+            if event.type == pygame.KEYDOWN:
+                if event.key == pygame.K_b:
+                    self.upgrade.show_menu = not self.upgrade.show_menu
+                elif event.key == PROFILE_KEY:
+                    self.profiler.toggle()
+                elif event.key == pygame.K_ESCAPE:
+                    # The live Game is kept for resume, writing to disk is a background extra
+                    if SAVE_ON_PAUSE:
+                        save_game_data(self.player, self.spawner, self.items_spawn)
+                    # SCREEN still holds the last presented frame
+                    snapshot = SCREEN.copy() if snapshot is None else snapshot
+                    return {"state":"pause", "snapshot":snapshot, "game": self}
+            if event.type == pygame.MOUSEWHEEL:
+                self.upgrade.scroll_offset -= event.y * self.upgrade.scroll_speed
+
+        hit_pos, dmg = self.player.update(events)  # or player.update()
+        if hit_pos:
+            # Applied on the next simulation tick
+            self.pending_hits.append((hit_pos, dmg))
+        return None
+
+    def step(self, dt, keys=None):
+        # One fixed simulation tick, keys overrides the keyboard (headless input)
+        hits = self.pending_hits
+        self.pending_hits = []
+
+        # Remember where everything was so rendering can interpolate
+        self.rectmap.begin_tick()
+        self.player.begin_tick()
+        for entity in self.items_spawn.spawned_items:
+            entity.begin_tick()
+        for entity in self.spawner.spawned_enemies:
+            entity.begin_tick()
+        for entity in self.spawner.bombs:
+            entity.begin_tick()
+        self.spawner.projectiles.begin_tick()
+        phases = self.phases
+        phases.lap("tick_setup")
+
+        self.difficulty.update(dt, self.spawner.spawned_enemies)
+        if self.difficulty.stage != self.pool_stage:
+            self.pool_stage = self.difficulty.stage
+            self.spawner.prewarm(self.difficulty.multiplier())
+            self.items_spawn.prewarm()
+        phases.lap("difficulty")
+        self.camera.camera_control(self.player, self.rectmap, dt, keys)
+        self.rectmap.scroll(self.camera)
+        self.player.follow(self.rectmap)
+        phases.lap("camera")
+
+        self.grid.begin_frame()
+        self.items_spawn.update(dt)
+        for item in self.items_spawn.spawned_items:
+            item.scroll(self.camera)
+            for hit_pos, dmg in hits:
+                if not item.destroyed and item.rect.collidepoint(hit_pos):
+                    item.on_click(self.player)
+
+            if item.destroyed:
+                self.items_spawn.despawn(item)
+            else:
+                self.grid.update(item)
+        phases.lap("items")
+
+        mult = self.difficulty.multiplier()
+        active = self.difficulty.state
+        self.spawner.update(dt, mult, active)
+        # No copy: destroy() only queues, dense is not touched until flush()
+        enemies = self.spawner.spawned_enemies.dense
+        kinematics = self.spawner.kinematics
+        kinematics.scroll(self.camera.offset_x, self.camera.offset_y)
+        kinematics.step(self.player, dt, self.camera)
+        phases.lap("enemies")
+
+        # Every enemy is bucketed where it moved to before any pair is tested, whatever the distance
+        for enemy in enemies:
+            self.grid.update(enemy)
+        for enemy in enemies:
+            # Only enemies and items sharing a grid cell are tested
+            pushed = False
+            for other in self.grid.candidates(enemy):
+                if not other.destroyed and enemy.resolve_collision(other.rect):
+                    self.grid.collisions += 1
+                    pushed = True
+            if pushed:
+                enemy.pos = enemy.rect.topleft  # The next tick moves it on from here
+                self.grid.update(enemy)
+
+            for hit_pos, dmg in hits:
+                if not enemy.destroyed and enemy.rect.collidepoint(hit_pos):
+                    enemy.take_damage(dmg)
+
+            if enemy.destroyed:
+                self.spawner.despawn(enemy)
+                self.player.gain_reward(enemy.reward)
+        phases.lap("collision")
+
+        self.collision_stats = self.grid.stats()
+        self.spawner.collect_spawns()
+        phases.lap("enemies")
+
+        for bomb in self.spawner.bombs:
+            bomb.scroll(self.camera)
+            bomb.update(dt, self.player)
+            for hit_pos, dmg in hits:
+                if not bomb.destroyed and bomb.rect.collidepoint(hit_pos):
+                    bomb.on_click()
+            if bomb.destroyed:
+                self.spawner.bombs.destroy(bomb)
+        phases.lap("bombs")
+
+        # Enemy bullets are processed in one batch
+        projectiles = self.spawner.projectiles
+        projectiles.begin_frame()
+        projectiles.scroll(self.camera.offset_x, self.camera.offset_y)
+        projectiles.update(dt)
+        bullet_dmg = projectiles.collide_rect(self.player.rect)
+        if bullet_dmg:
+            self.player.take_dmg(bullet_dmg)
+        projectiles.cull(self.rectmap.rect)
+        phases.lap("projectiles")
+
+        # Everything destroyed this tick is removed in one pass
+        for entity in self.spawner.flush() + self.items_spawn.flush():
+            self.grid.remove(entity)
+        phases.lap("flush")
+
+        self.autosave.update(dt, self)
+        phases.lap("autosave")
+        self.killcam.record(self)
+        phases.lap("killcam")
+
+    def draw(self, alpha):
+        # alpha: how far rendering is between the previous tick and the current one
+        phases = self.phases
+        renderer = self.renderer
+        # Only the map moves the background, and only the camera moves the map
+        map_pos = lerp_rect(self.rectmap.rect, getattr(self.rectmap, "_prev", None), alpha).topleft
+        renderer.begin_frame(map_pos, lambda: self.draw_background(alpha))
+        phases.lap("draw_world")
+        renderer.mark(self.difficulty.draw())
+
+        # self.carriage.draw(self.camera)
+        renderer.mark(self.player.draw_UI())
+        phases.lap("draw_hud")
+        renderer.mark(self.player.draw_Object(alpha))
+
+        culler = self.culler
+        culler.begin_frame()
+        for item in culler.visible(self.items_spawn.spawned_items):
+            renderer.mark(item.draw(alpha))
+        for enemy in culler.visible(self.spawner.spawned_enemies):
+            renderer.mark(enemy.draw(alpha))
+        for bomb in culler.visible(self.spawner.bombs, Bomb.draw_bounds):
+            renderer.mark(bomb.draw(alpha))
+        projectiles = self.spawner.projectiles
+        drawn = projectiles.draw(SCREEN, alpha, view=culler.view)
+        culler.tally(len(drawn), len(projectiles))
+        for rect in drawn:
+            renderer.mark(rect)
+        phases.lap("draw_world")
+
+    def draw_background(self, alpha):
+        SCREEN.fill(DESERT)
+        self.rectmap.draw(alpha)
+        self.rectmap.draw_border_overlay()
+
+    def entity_counts(self):
+        return {
+            "enemies": len(self.spawner.spawned_enemies),
+            "bombs": len(self.spawner.bombs),
+            "bullets": len(self.spawner.projectiles),
+            "items": len(self.items_spawn.spawned_items),
+            "drawn": self.culler.drawn,
+            "culled": self.culler.culled,
+            # Broadphase of the last tick: pairs it handed to the exact test, and how many touched
+            "pairs": self.collision_stats["candidate_pairs"],
+            "collisions": self.collision_stats["collisions"],
+        }
 
-            # self.carriage.draw(self.camera)
-            self.player.draw_UI()
-            self.player.draw_Object(self.rectmap)
-            hit_pos, dmg = self.player.update(events)  # or player.update()
-
-            self.items_spawn.update(dt)
-            for item in self.items_spawn.spawned_items:
-                item.draw(self.camera)
-                if hit_pos:
-                    if not item.destroyed and item.rect.collidepoint(hit_pos):
-                        item.on_click(self.player)
-
-                if item.destroyed:
-                    self.items_spawn.spawned_items.remove(item)
-
-            mult = self.difficulty.multiplier()
-            active = self.difficulty.state
-            self.spawner.update(dt, mult, active)
-            enemies.extend(self.spawner.spawned_enemies)
-            for enemy in enemies:
-                enemy.draw(self.camera)
-                enemy.update(self.player, dt, self.camera)
-
-
-                for other in self.spawner.spawned_enemies:
-                    if other is not enemy and not other.destroyed:
-                        enemy.resolve_collision(other.rect)
-
-                # Prevent overlap with items
-                for item in self.items_spawn.spawned_items:
-                    if not item.destroyed:
-                        enemy.resolve_collision(item.rect)
-
-                for bullet in enemy.bullets[:]:
-                    bullet.draw(self.camera)
-                    bullet.update(dt)
-                    if self.player.rect.colliderect(bullet.rect):
-                        self.player.take_dmg(bullet.dmg)
-                        enemy.bullets.remove(bullet)
-
-                for bomb in enemy.bombs[:]:
-                    bomb.draw(self.camera)
-                    bomb.update(dt, self.player)
-                    if hit_pos:
-                        if not bomb.destroyed and bomb.rect.collidepoint(hit_pos):
-                            bomb.on_click()
-                    if bomb.destroyed:
-                        enemy.bombs.remove(bomb)
-
-                if hit_pos:
-                    if not enemy.destroyed and enemy.rect.collidepoint(hit_pos):
-                        enemy.take_damage(dmg)
-                    
-                        
-                if enemy.destroyed:
-                    self.spawner.spawned_enemies.remove(enemy)
-                    self.player.gain_reward(enemy.reward)
+    def run(self):
+        result = None
+        try:
+            result = self._run()
+            return result
+        finally:
+            # A paused Game is resumed as it is, its profiler keeps streaming
+            if not (isinstance(result, dict) and result.get("state") == "pause"):
+                self.profiler.close()
+
+    def _run(self):
+        clock = pygame.time.Clock()
+        clock.tick()  # Resuming: the time spent paused is not simulated
+        tick_dt = 1 / self.sim_hz
+        accumulator = 0.0
 
+        self.renderer.invalidate()  # Menus drew over SCREEN since the last frame
+        while True:
+            frame_dt = clock.tick(self.render_fps) / 1000
+            self.phases.begin_frame()
+            self.profiler.record(frame_dt, self.entity_counts)
+            report_saves()
+            events = pygame.event.get()
+            result = self.handle_events(events, None)
+            if result:
+                return result
+            self.phases.lap("events")
+
+            # Fixed-step simulation, catching up at most max_sim_steps per frame
+            accumulator += frame_dt
+            steps = 0
+            while accumulator >= tick_dt and steps < self.max_sim_steps:
+                self.step(tick_dt)
+                accumulator -= tick_dt
+                steps += 1
+            if steps == self.max_sim_steps:
+                accumulator = min(accumulator, tick_dt)  # Too far behind, drop the backlog
+
+            self.draw(accumulator / tick_dt)
 
             if self.player.hp <= 0 and not self.game_over:
+                self.autosave.discard()
+                snapshot = SCREEN.copy()
+                self.kill_cam_screen()
                 result = self.game_over_screen(snapshot)
                 if result == "try again":
                     return "new_game"
@@ -185,12 +396,13 @@ class Game():
             
             if self.upgrade.show_menu:
                 self.upgrade.upgrade_menu(self.player)
+                self.renderer.invalidate()
+            self.phases.lap("draw_hud")
+            self.renderer.mark(self.profiler.draw(SCREEN))
+            self.phases.lap("profiler")
 
-
-         
-
-            snapshot = SCREEN.copy()
-            pygame.display.flip()
+            self.renderer.present()
+            self.phases.lap("flip")
 
 
 def menu(events):
@@ -235,7 +447,7 @@ def new_game():
 
 
 def load_game():
-    save_data = load_save_data()
+    save_data = latest_save()
     if save_data:
         game = Game(load_data=save_data)
         return game.run()
@@ -306,8 +518,8 @@ def pause_game(snapshot):
             bttn.draw(hover=hover)
 
         # Draw title
-        font = pygame.font.Font(None, 74)
-        text = font.render("Pause", True, (0, 0, 0))
+        font = get_font(None, 74)
+        text = TEXT_CACHE.render("Pause", font, (0, 0, 0))
         text_rect = text.get_rect(center=(pause_screen.posx + pause_screen.rect.width // 2, pause_screen.posy+ 50))
         SCREEN.blit(text, text_rect)
 
@@ -317,34 +529,34 @@ def game_loop():
     running = True
     clock = pygame.time.Clock()
     state = "menu"
+    game = None  # Paused Game, resumed in memory
     while running:
         clock.tick(60)  # Limit frame rate to 60 FPS
         SCREEN.fill(DESERT)
         events = pygame.event.get()
+        report_saves()
             
         if state == 'menu':
             state = menu(events)
             pygame.display.flip()
+            STARTUP.frame_presented()  # Startup report, once
             continue
-        elif state == "new_game":
-            result = new_game()
+        elif state in ("new_game", "load_game", "resume"):
+            if state == "new_game":
+                result = new_game()
+            elif state == "load_game":
+                result = load_game()
+            else:
+                result = game.run()  # Same Game instance, exactly as it was paused
+
             if isinstance(result, dict):
                 state = result["state"]
                 snapshot = result.get("snapshot", None)  # save for pause menu
-                player, spawners, items = result.get("saved_data", (None, []))
+                game = result.get("game")
             else:
                 state = result
             pygame.display.flip()
             continue
-        elif state == "load_game":
-            save_data = load_save_data()
-            if save_data:
-                result = load_game()
-                state = result["state"]
-                snapshot = result.get("snapshot", None)
-            else:
-                print("No valid save data. Returning to menu.")
-                state = "menu"
         elif state == "setting":
             state = setting()
         elif state == "credit":
@@ -354,16 +566,21 @@ def game_loop():
         elif state == "pause":
             result = pause_game(snapshot)
             if result == "resume":
-                snapshot = SCREEN.copy()
-                state = "load_game"
+                state = "resume"
             else:
+                game = None  # Back to the menu, the background save is all that's kept
                 state = result
 
             
         pygame.display.flip()
 
+    # The last save must be on disk before the process goes away
+    SAVE_WORKER.shutdown()
+    JOURNAL_WRITER.shutdown()
+    report_saves()
     pygame.quit()
 
 
 # Run the game
-game_loop()
+if __name__ == "__main__":
+    game_loop()
@@ -0,0 +1,372 @@
+import pygame
+import numpy
+
+
+# === BROADPHASE ===
+class SpatialHash:
+    """ Uniform grid of cells -> objects, kept up to date as objects move """
+    def __init__(self, cell_size=128):
+        self.cell_size = cell_size
+        self.cells = {}       # (cx, cy) -> set of objects
+        self._spans = {}      # id(obj) -> (obj, (cx0, cy0, cx1, cy1))
+
+        # Per frame stats
+        self.candidate_pairs = 0
+        self.collisions = 0
+        self.rebuckets = 0
+
+    def _span(self, rect):
+        size = self.cell_size
+        return (rect.left // size, rect.top // size, (rect.right - 1) // size, (rect.bottom - 1) // size)
+
+    def _add_cells(self, obj, span):
+        x0, y0, x1, y1 = span
+        for cx in range(x0, x1 + 1):
+            for cy in range(y0, y1 + 1):
+                cell = self.cells.get((cx, cy))
+                if cell is None:
+                    cell = self.cells[(cx, cy)] = set()
+                cell.add(obj)
+
+    def _remove_cells(self, obj, span):
+        x0, y0, x1, y1 = span
+        for cx in range(x0, x1 + 1):
+            for cy in range(y0, y1 + 1):
+                cell = self.cells.get((cx, cy))
+                if cell is None:
+                    continue
+                cell.discard(obj)
+                if not cell:
+                    del self.cells[(cx, cy)]
+
+    def update(self, obj):
+        # Insert new objects, re-bucket moved ones only when they change cells
+        span = self._span(obj.rect)
+        entry = self._spans.get(id(obj))
+        if entry is not None:
+            if entry[1] == span:
+                return
+            self._remove_cells(obj, entry[1])
+            self.rebuckets += 1
+        self._add_cells(obj, span)
+        self._spans[id(obj)] = (obj, span)
+
+    def remove(self, obj):
+        entry = self._spans.pop(id(obj), None)
+        if entry is not None:
+            self._remove_cells(obj, entry[1])
+
+    def query(self, rect):
+        x0, y0, x1, y1 = self._span(rect)
+        if x0 == x1 and y0 == y1:
+            return self.cells.get((x0, y0), ())
+
+        found = set()
+        for cx in range(x0, x1 + 1):
+            for cy in range(y0, y1 + 1):
+                cell = self.cells.get((cx, cy))
+                if cell:
+                    found.update(cell)
+        return found
+
+    def candidates(self, obj):
+        # Objects sharing a cell with obj (excluding obj), counted as broadphase pairs
+        found = [other for other in self.query(obj.rect) if other is not obj]
+        self.candidate_pairs += len(found)
+        return found
+
+    def clear(self):
+        self.cells.clear()
+        self._spans.clear()
+
+    def begin_frame(self):
+        self.candidate_pairs = 0
+        self.collisions = 0
+        self.rebuckets = 0
+
+    def stats(self):
+        return {
+            "objects": len(self._spans),
+            "cells": len(self.cells),
+            "candidate_pairs": self.candidate_pairs,
+            "collisions": self.collisions,
+            "rebuckets": self.rebuckets,
+        }
+
+    def __contains__(self, obj):
+        return id(obj) in self._spans
+
+    def __len__(self):
+        return len(self._spans)
+
+
+# === PROJECTILES ===
+BULLET_LIFETIME = 5.0  # seconds before an enemy bullet is culled
+BULLET_COLOR = (255, 50, 50)
+BULLET_FIELDS = 8  # Columns per bullet in ProjectileStore.to_bytes()
+
+
+class ProjectileStore:
+    """ Enemy bullets as parallel arrays, updated and hit-tested in batches """
+    def __init__(self, capacity=256):
+        self.count = 0
+        self.pos = numpy.zeros((capacity, 2))
+        self.prev = numpy.zeros((capacity, 2))  # Position at the start of the tick
+        self.vel = numpy.zeros((capacity, 2))
+        self.speed = numpy.zeros(capacity)
+        self.radius = numpy.zeros(capacity)
+        self.dmg = numpy.zeros(capacity)
+        self.life = numpy.zeros(capacity)
+        self.layout = 0  # Bumped whenever rows are added, removed or moved
+
+        # Per frame stats
+        self.hits = 0
+        self.culled = 0
+
+    def _columns(self):
+        return (self.pos, self.prev, self.vel, self.speed, self.radius, self.dmg, self.life)
+
+    def _grow(self):
+        capacity = len(self.life) * 2
+        self.pos, self.prev, self.vel, self.speed, self.radius, self.dmg, self.life = [
+            numpy.resize(column, (capacity,) + column.shape[1:]) for column in self._columns()
+        ]
+
+    def add(self, x, y, vx, vy, radius, dmg, speed, life=BULLET_LIFETIME):
+        if self.count == len(self.life):
+            self._grow()
+        i = self.count
+        self.pos[i] = (x, y)
+        self.prev[i] = (x, y)
+        self.vel[i] = (vx, vy)
+        self.speed[i] = speed
+        self.radius[i] = radius
+        self.dmg[i] = dmg
+        self.life[i] = life
+        self.count += 1
+        self.layout += 1
+
+    def add_bullet(self, bullet):
+        self.add(bullet.pos.x, bullet.pos.y, bullet.vel.x, bullet.vel.y,
+                 bullet.radius, bullet.dmg, bullet.speed, getattr(bullet, "lifetime", BULLET_LIFETIME))
+
+    def remove(self, indices):
+        # Swap-remove: the last live bullet fills each hole, highest index first
+        for i in sorted(indices, reverse=True):
+            last = self.count - 1
+            if i != last:
+                for column in self._columns():
+                    column[i] = column[last]
+            self.count -= 1
+        self.layout += 1
+
+    def clear(self):
+        self.count = 0
+        self.layout += 1
+
+    def begin_tick(self):
+        self.prev[:self.count] = self.pos[:self.count]
+
+    def scroll(self, dx, dy):
+        # Camera moves the world, same as the entity draw() calls
+        if self.count:
+            self.pos[:self.count] -= (dx, dy)
+
+    def update(self, dt):
+        n = self.count
+        self.pos[:n] += self.vel[:n] * dt
+        self.life[:n] -= dt
+
+    def _rects(self):
+        # Same integer AABB as Bullet.rect
+        n = self.count
+        left = (self.pos[:n] - self.radius[:n, None]).astype(int)
+        size = (self.radius[:n] * 2).astype(int)
+        return left[:, 0], left[:, 1], size
+
+    def collide_rect(self, rect):
+        # Remove every bullet overlapping rect and return the total damage
+        if not self.count:
+            return 0
+        x, y, size = self._rects()
+        hit = (x < rect.right) & (x + size > rect.left) & (y < rect.bottom) & (y + size > rect.top)
+        indices = numpy.flatnonzero(hit)
+        if not len(indices):
+            return 0
+
+        dmg = float(self.dmg[indices].sum())
+        self.hits += len(indices)
+        self.remove(indices.tolist())
+        return dmg
+
+    def cull(self, bounds, margin=100):
+        # Drop bullets that expired or left the world
+        if not self.count:
+            return
+        n = self.count
+        area = bounds.inflate(margin * 2, margin * 2)
+        px, py = self.pos[:n, 0], self.pos[:n, 1]
+        dead = (self.life[:n] <= 0) | (px < area.left) | (px > area.right) | (py < area.top) | (py > area.bottom)
+        indices = numpy.flatnonzero(dead)
+        if len(indices):
+            self.culled += len(indices)
+            self.remove(indices.tolist())
+
+    def draw(self, surface, alpha=1.0, color=BULLET_COLOR, view=None):
+        # view: Rect, bullets entirely outside it are skipped. Returns the rects drawn
+        n = self.count
+        pos = self.pos[:n]
+        radius = self.radius[:n]
+        if alpha < 1.0:
+            pos = self.prev[:n] + (pos - self.prev[:n]) * alpha
+        if view is not None:
+            x, y = pos[:, 0], pos[:, 1]
+            inside = ((x + radius >= view.left) & (x - radius < view.right)
+                      & (y + radius >= view.top) & (y - radius < view.bottom))
+            pos = pos[inside]
+            radius = radius[inside]
+        circle = pygame.draw.circle
+        return [circle(surface, color, (x, y), r) for (x, y), r in zip(pos.astype(int).tolist(), radius.tolist())]
+
+    def begin_frame(self):
+        self.hits = 0
+        self.culled = 0
+
+    def load(self, bullets):
+        # Bullet dicts, as older saves store them
+        for data in bullets:
+            x, y = data["pos"]["value"]
+            vx, vy = data["vel"]["value"]
+            self.add(x, y, vx, vy, data["radius"], data["dmg"], data["speed"], data.get("lifetime", BULLET_LIFETIME))
+
+    def to_bytes(self):
+        # Packed little-endian float64 rows of x, y, vx, vy, speed, radius, dmg, life
+        n = self.count
+        rows = numpy.column_stack((self.pos[:n], self.vel[:n], self.speed[:n], self.radius[:n], self.dmg[:n], self.life[:n]))
+        return rows.astype("<f8").tobytes()
+
+    def load_bytes(self, blob):
+        rows = numpy.frombuffer(blob, dtype="<f8").reshape(-1, BULLET_FIELDS)
+        n = len(rows)
+        while len(self.life) < self.count + n:
+            self._grow()
+        live = slice(self.count, self.count + n)
+        self.pos[live] = rows[:, 0:2]
+        self.prev[live] = rows[:, 0:2]
+        self.vel[live] = rows[:, 2:4]
+        self.speed[live] = rows[:, 4]
+        self.radius[live] = rows[:, 5]
+        self.dmg[live] = rows[:, 6]
+        self.life[live] = rows[:, 7]
+        self.count += n
+        self.layout += 1
+
+    def __len__(self):
+        return self.count
+
+
+# === ENEMY MOVEMENT ===
+def round_rect(values):
+    # Half away from zero, what assigning a float to a Rect attribute does
+    whole = numpy.trunc(values)
+    whole += numpy.copysign(numpy.abs(values - whole) >= 0.5, values)
+    return whole
+
+
+class EnemyKinematics:
+    """ Movement state of every spawned enemy as arrays indexed by registry slot, like ProjectileStore
+    keeps bullets. add() when an enemy is spawned, remove() when it is flushed: in between its position
+    and velocity live here (Enemy.pos/vel are views of its row) and its rect follows them.
+    Scrolling, steering, speed clamping and integration are a few array operations for all of them,
+    enemies decide how to steer in Enemy.act() """
+    def __init__(self, registry, capacity=64):
+        self.registry = registry
+        self.pos = numpy.zeros((capacity, 2))       # Screen space, rect.topleft between ticks
+        self.vel = numpy.zeros((capacity, 2))
+        self.max_spd = numpy.zeros(capacity)        # Set at spawn
+        self.half = numpy.zeros((capacity, 2))      # Rect center offset, (w // 2, h // 2)
+        self._rows = (None, None)  # (registry layout, slot of each entity in registry.dense)
+        self.moved = 0  # Per frame stats
+
+    def _grow(self):
+        capacity = len(self.max_spd) * 2
+        self.pos, self.vel, self.max_spd, self.half = [
+            numpy.resize(column, (capacity,) + column.shape[1:])
+            for column in (self.pos, self.vel, self.max_spd, self.half)
+        ]
+
+    def add(self, enemy):
+        # Right after registry.create(enemy): its row takes over from the enemy's own pos/vel
+        row = self.registry.slot(enemy)
+        while row >= len(self.max_spd):
+            self._grow()
+        rect = enemy.rect
+        self.pos[row] = rect.topleft
+        self.vel[row] = enemy.vel
+        self.max_spd[row] = enemy.max_spd
+        self.half[row] = (rect.width // 2, rect.height // 2)
+        enemy.bind(self, row)
+
+    def remove(self, enemy):
+        # Flushed: the row is free for the next enemy to take the slot
+        enemy.unbind()
+
+    def rows(self):
+        # Rows of registry.dense in order, rebuilt only when an enemy was added or removed
+        registry = self.registry
+        layout = (registry.created, registry.destroyed)
+        if self._rows[0] != layout:
+            self._rows = (layout, numpy.array(registry.slots, dtype=numpy.intp))
+        return self._rows[1]
+
+    def positions(self):
+        # Rect topleft of each enemy in registry.dense order, between ticks. take() is far cheaper than [rows]
+        return self.pos.take(self.rows(), axis=0)
+
+    def scroll(self, dx, dy):
+        # Camera moved the world, every enemy shifts the other way
+        rows = self.rows()
+        if len(rows):
+            self.pos[rows] -= (dx, dy)
+
+    def step(self, player, dt, camera):
+        enemies = self.registry.dense
+        rows = self.rows()
+        self.moved = 0
+        if not len(rows):
+            return
+
+        # Rects take the scrolled positions first: act() and the distances see them, not the fractions
+        topleft = round_rect(self.pos[rows])
+        target_pos = pygame.Vector2(player.rect.center)
+        direction = numpy.subtract(player.rect.center, topleft + self.half[rows])
+        distance = numpy.hypot(direction[:, 0], direction[:, 1])
+
+        steer = []
+        for enemy, xy, d in zip(enemies, topleft.tolist(), distance.tolist()):
+            enemy.rect.topleft = xy
+            steer.append(enemy.act(player, target_pos, d, dt, camera))
+        steer = numpy.array(steer, dtype=float)
+
+        # Enemies standing on the player's center don't move at all.
+        # act() can teleport or stop an enemy, so state is read after it
+        moving = numpy.flatnonzero(distance)
+        if len(moving):
+            movers = rows[moving]
+            pos, vel, max_spd = self.pos[movers], self.vel[movers], self.max_spd[movers]
+            unit = direction[moving] / distance[moving, None]
+            vel += unit * (max_spd * steer[moving])[:, None] * dt
+            speed = numpy.hypot(vel[:, 0], vel[:, 1])
+            over = speed > max_spd
+            if over.any():
+                vel[over] *= (max_spd[over] / speed[over])[:, None]
+            pos += vel * dt
+            self.vel[movers] = vel
+            self.pos[movers] = pos
+
+            for i, xy in zip(moving.tolist(), pos.tolist()):
+                enemies[i].rect.topleft = xy
+            self.moved = len(movers)
+
+        # The rects rounded the fractions away, the next tick starts from where they are
+        self.pos[rows] = round_rect(self.pos[rows])
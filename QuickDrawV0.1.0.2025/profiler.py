@@ -0,0 +1,164 @@
+import os
+import csv
+import time
+from collections import deque
+
+import pygame
+from config import *
+
+
+# === FRAME TIMING ===
+class PhaseTimer:
+    """ Wall time of each named phase in a frame, measured as laps between marks """
+    def __init__(self):
+        self.current = {}  # phase -> seconds, frame in progress
+        self.last = {}     # phase -> seconds, last finished frame
+        self._mark = time.perf_counter()
+
+    def begin_frame(self):
+        self.last = self.current
+        self.current = {}
+        self._mark = time.perf_counter()
+
+    def lap(self, name):
+        # Time since the previous mark is charged to name
+        now = time.perf_counter()
+        self.current[name] = self.current.get(name, 0.0) + (now - self._mark)
+        self._mark = now
+
+    def skip(self):
+        # Drop the time since the previous mark (e.g. frame limiter sleep)
+        self._mark = time.perf_counter()
+
+
+# === PROFILER OVERLAY ===
+# Phases in display/CSV order, as recorded by Game.run()/step()/draw()
+PROFILE_PHASES = (
+    "events", "tick_setup", "difficulty", "camera", "items", "enemies", "collision",
+    "bombs", "projectiles", "flush", "autosave", "killcam", "draw_world", "draw_hud", "profiler", "flip",
+)
+PROFILE_KEY = pygame.K_F3
+PROFILE_CSV = os.environ.get("QUICKDRAW_PROFILE_CSV")  # Stream from startup to this file
+PROFILE_CSV_DEFAULT = DATA_DIR / "profile.csv"
+COUNTS_PER_LINE = 4  # Entity counts under the phase table
+
+
+class FrameProfiler:
+    """ Rolling frame time graph and per-phase timings, streamed to CSV while on """
+    def __init__(self, timer, history=240, csv_path=PROFILE_CSV):
+        self.timer = timer
+        self.frame_ms = deque(maxlen=history)   # Frame to frame time
+        self.work_ms = deque(maxlen=history)    # Sum of the phases
+        self.phase_ms = {name: deque(maxlen=30) for name in PROFILE_PHASES}
+        self.counts = {}
+        self.frame = 0
+        self.visible = False
+        self.budget_ms = 1000 / 60
+
+        self.csv_path = csv_path
+        self._file = None
+        self._writer = None
+        self._panel = None
+        self._text = None
+        if csv_path:
+            self.open_csv(csv_path)
+
+    def toggle(self):
+        self.visible = not self.visible
+        if self.visible and self._writer is None:
+            self.open_csv(self.csv_path or PROFILE_CSV_DEFAULT)
+
+    def open_csv(self, path):
+        # Line buffered: rows survive a crash, which is when they matter. Appended, turning the
+        # profiler off and on again (or a new game) must not wipe the rows already written
+        Path(path).parent.mkdir(exist_ok=True)
+        self._file = open(path, "a", newline="", buffering=1)
+        self._writer = csv.writer(self._file)
+        if self._file.tell() == 0:
+            self._writer.writerow(["frame", "time_ms", "frame_ms", *PROFILE_PHASES,
+                                   "n_enemies", "n_bombs", "n_bullets", "n_items", "n_drawn", "n_culled",
+                                   "n_pairs", "n_collisions"])
+        print(f"Profiling to {path}")
+
+    def close(self):
+        if self._file:
+            self._file.close()
+        self._file = None
+        self._writer = None
+
+    def record(self, frame_dt, get_counts):
+        # Call right after timer.begin_frame(): timer.last is the frame that just ended
+        self.frame += 1
+        if not (self.visible or self._writer):
+            return
+
+        counts = get_counts()
+        last = self.timer.last
+        frame_ms = frame_dt * 1000
+        self.frame_ms.append(frame_ms)
+        self.work_ms.append(sum(last.values()) * 1000)
+        for name, samples in self.phase_ms.items():
+            samples.append(last.get(name, 0.0) * 1000)
+        self.counts = counts
+
+        if self._writer:
+            self._writer.writerow([
+                self.frame, get_ticks(), round(frame_ms, 3),
+                *(round(last.get(name, 0.0) * 1000, 3) for name in PROFILE_PHASES),
+                counts.get("enemies", 0), counts.get("bombs", 0), counts.get("bullets", 0), counts.get("items", 0),
+                counts.get("drawn", 0), counts.get("culled", 0),
+                counts.get("pairs", 0), counts.get("collisions", 0),
+            ])
+
+    # --- Overlay ---
+    def _build_text(self, font):
+        # Re-rendered a few times a second, the numbers are unreadable at 60 Hz anyway.
+        # Straight font.render: these strings are different every time, caching them only evicts the HUD
+        rows = [("frame", self._avg(self.frame_ms), None), ("work", self._avg(self.work_ms), max(self.work_ms, default=0))]
+        rows += [(name, self._avg(samples), max(samples, default=0)) for name, samples in self.phase_ms.items()]
+        counts = [f"{key} {value}" for key, value in self.counts.items()]
+        count_lines = ["  ".join(counts[i:i + COUNTS_PER_LINE]) for i in range(0, len(counts), COUNTS_PER_LINE)]
+
+        height = font.get_linesize()
+        surface = pygame.Surface((self._panel.get_width(), height * (len(rows) + len(count_lines))), pygame.SRCALPHA)
+        for i, (name, avg, peak) in enumerate(rows):
+            y = i * height
+            surface.blit(font.render(name, True, WHITE), (PADDING, y))
+            surface.blit(font.render(f"{avg:.2f} ms", True, WHITE), (PADDING + 110, y))
+            if peak is not None:
+                surface.blit(font.render(f"max {peak:.2f}", True, WHITE), (PADDING + 200, y))
+        for i, line in enumerate(count_lines):
+            surface.blit(font.render(line, True, WHITE), (PADDING, (len(rows) + i) * height))
+        return surface
+
+    @staticmethod
+    def _avg(samples):
+        return sum(samples) / len(samples) if samples else 0.0
+
+    def draw(self, surface):
+        if not self.visible:
+            return
+        font = get_font(None, 20)
+        graph_h = 80
+        if self._panel is None:
+            text_h = font.get_linesize() * (len(PROFILE_PHASES) + 4)
+            self._panel = pygame.Surface((340, graph_h + text_h + PADDING * 3), pygame.SRCALPHA)
+        if self._text is None or self.frame % 15 == 0:
+            self._text = self._build_text(font)
+
+        panel = self._panel
+        panel.fill((0, 0, 0, 170))
+
+        # Frame time graph, the line is the frame budget at 2/3 of the height
+        width = panel.get_width() - PADDING * 2
+        scale = graph_h * 2 / 3 / self.budget_ms
+        budget_y = PADDING + graph_h - int(self.budget_ms * scale)
+        pygame.draw.line(panel, YELLOW, (PADDING, budget_y), (PADDING + width, budget_y))
+        if len(self.frame_ms) > 1:
+            step = width / (self.frame_ms.maxlen - 1)
+            points = [(PADDING + i * step, PADDING + graph_h - min(graph_h, int(ms * scale)))
+                      for i, ms in enumerate(self.frame_ms)]
+            pygame.draw.lines(panel, GREEN, False, points)
+
+        panel.blit(self._text, (0, graph_h + PADDING * 2))
+        return surface.blit(panel, (surface.get_width() - panel.get_width() - MARGIN, MARGIN))